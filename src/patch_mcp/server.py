@@ -1,7 +1,7 @@
 """MCP Server for File Patch operations.
 
 This module implements the Model Context Protocol (MCP) server that registers
-and routes all 7 patch tools.
+and routes all 8 tools.
 
 Tools provided:
     1. apply_patch - Apply a patch to a file (supports dry_run)
@@ -11,11 +11,12 @@ Tools provided:
     5. inspect_patch - Analyze patch content
     6. backup_file - Create a timestamped backup
     7. restore_backup - Restore a file from backup
+    8. batch_tools - Run several of the above in one call
 """
 
 import asyncio
 import json
-from typing import Any
+from typing import Any, Dict
 
 from mcp.server import Server
 from mcp.types import Resource, TextContent, Tool
@@ -23,13 +24,43 @@ from mcp.types import Resource, TextContent, Tool
 # Import all tool implementations
 from .tools import apply, backup, generate, inspect, revert, validate
 
+try:
+    # Optional: orjson serializes results several times faster than the json module
+    import orjson
+
+    def _dump_result(result: Dict[str, Any]) -> str:
+        try:
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except orjson.JSONEncodeError:
+            # orjson rejects strings that json escapes, such as the lone surrogates
+            # of a file path with undecodable bytes
+            return json.dumps(result, indent=2)
+
+except ImportError:
+
+    def _dump_result(result: Dict[str, Any]) -> str:
+        return json.dumps(result, indent=2)
+
+
 # Create MCP server instance
 server = Server("patch-mcp")
 
+# Tools that batch_tools can run (every tool except batch_tools itself), mapped to
+# the arguments their input schema requires
+BATCHABLE_TOOLS: Dict[str, tuple[str, ...]] = {
+    "apply_patch": ("file_path", "patch"),
+    "validate_patch": ("file_path", "patch"),
+    "revert_patch": ("file_path", "patch"),
+    "generate_patch": ("original_file", "modified_file"),
+    "inspect_patch": ("patch",),
+    "backup_file": ("file_path",),
+    "restore_backup": ("backup_file",),
+}
+
 
 @server.list_tools()  # type: ignore[misc,no-untyped-call]
 async def list_tools() -> list[Tool]:
-    """List all 7 available tools with their schemas.
+    """List all 8 available tools with their schemas.
 
     Returns:
         List of Tool objects with proper input schemas
@@ -189,6 +220,35 @@ FEATURES:
                 "required": ["backup_file"],
             },
         ),
+        Tool(
+            name="batch_tools",
+            description="Run several tool calls in order in one request. Stops at the first "
+            "operation that fails; later operations are not run.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "operations": {
+                        "type": "array",
+                        "description": "Tool calls to run, in order",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "tool": {
+                                    "type": "string",
+                                    "description": "Name of the tool to call",
+                                },
+                                "arguments": {
+                                    "type": "object",
+                                    "description": "Arguments for the tool",
+                                },
+                            },
+                            "required": ["tool", "arguments"],
+                        },
+                    },
+                },
+                "required": ["operations"],
+            },
+        ),
     ]
 
 
@@ -259,36 +319,55 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     Raises:
         ValueError: If tool name is unknown
     """
-    result = None
+    if name == "batch_tools":
+        result = _batch_tools(arguments["operations"])
+    else:
+        result = _run_tool(name, arguments)
 
+    return [TextContent(type="text", text=_dump_result(result))]
+
+
+def _run_tool(name: str, arguments: dict[str, Any]) -> Dict[str, Any]:
+    """Run a single tool and return its result dict.
+
+    Args:
+        name: Name of the tool to call
+        arguments: Dictionary of tool arguments
+
+    Returns:
+        The tool's result dict
+
+    Raises:
+        ValueError: If tool name is unknown
+    """
     if name == "apply_patch":
-        result = apply.apply_patch(
+        return apply.apply_patch(
             arguments["file_path"],
             arguments["patch"],
             arguments.get("dry_run", False),
         )
     elif name == "validate_patch":
-        result = validate.validate_patch(
+        return validate.validate_patch(
             arguments["file_path"],
             arguments["patch"],
         )
     elif name == "revert_patch":
-        result = revert.revert_patch(
+        return revert.revert_patch(
             arguments["file_path"],
             arguments["patch"],
         )
     elif name == "generate_patch":
-        result = generate.generate_patch(
+        return generate.generate_patch(
             arguments["original_file"],
             arguments["modified_file"],
             arguments.get("context_lines", 3),
         )
     elif name == "inspect_patch":
-        result = inspect.inspect_patch(arguments["patch"])
+        return inspect.inspect_patch(arguments["patch"])
     elif name == "backup_file":
-        result = backup.backup_file(arguments["file_path"])
+        return backup.backup_file(arguments["file_path"])
     elif name == "restore_backup":
-        result = backup.restore_backup(
+        return backup.restore_backup(
             arguments["backup_file"],
             arguments.get("target_file"),
             arguments.get("force", False),
@@ -296,7 +375,69 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     else:
         raise ValueError(f"Unknown tool: {name}")
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+def _batch_tools(operations: list[dict[str, Any]]) -> Dict[str, Any]:
+    """Run several tool calls in order and collect their results.
+
+    Operations run sequentially, so a later operation sees the effects of the
+    earlier ones (e.g. validate_patch then apply_patch). The batch stops at the
+    first operation that fails.
+
+    Args:
+        operations: List of {"tool": str, "arguments": dict} entries
+
+    Returns:
+        Dict with the following structure:
+            {
+                "success": bool,  # True only if every operation succeeded
+                "total_operations": int,
+                "completed_count": int,
+                "results": List[Dict],  # Result of each operation that ran
+                "message": str
+            }
+
+    Raises:
+        ValueError: If any operation names an unknown tool or lacks a required
+            argument (checked before any operation runs, so a malformed batch
+            never leaves earlier operations applied)
+    """
+    for index, operation in enumerate(operations, start=1):
+        if operation["tool"] not in BATCHABLE_TOOLS:
+            raise ValueError(f"Unknown tool in batch_tools: {operation['tool']}")
+        missing = [
+            argument
+            for argument in BATCHABLE_TOOLS[operation["tool"]]
+            if argument not in operation.get("arguments", {})
+        ]
+        if missing:
+            raise ValueError(
+                f"Operation {index} ({operation['tool']}) in batch_tools is missing "
+                f"required arguments: {', '.join(missing)}"
+            )
+
+    results: list[Dict[str, Any]] = []
+    for operation in operations:
+        result = _run_tool(operation["tool"], operation.get("arguments", {}))
+        results.append(result)
+        if not result["success"]:
+            break
+
+    completed_count = sum(1 for result in results if result["success"])
+    total_operations = len(operations)
+
+    if completed_count == total_operations:
+        message = f"Completed all {total_operations} operations"
+    else:
+        failed = operations[len(results) - 1]["tool"]
+        message = f"Stopped at operation {len(results)} of {total_operations} ({failed} failed)"
+
+    return {
+        "success": completed_count == total_operations,
+        "total_operations": total_operations,
+        "completed_count": completed_count,
+        "results": results,
+        "message": message,
+    }
 
 
 async def main() -> None:
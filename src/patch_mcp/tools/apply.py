@@ -6,13 +6,11 @@ with comprehensive security checks and optional dry-run mode.
 CRITICAL: Supports dry_run parameter for testing without modification.
 """
 
-import os
-import tempfile
 from pathlib import Path
 from typing import Any, Dict
 
-from ..utils import atomic_file_replace, validate_file_safety
-from .validate import validate_patch
+from ..utils import atomic_file_write, check_patch_size, read_file_bytes, validate_file_safety
+from .validate import _Hunk, _parsed_patch, _validate_checked_file
 
 
 def apply_patch(file_path: str, patch: str, dry_run: bool = False) -> Dict[str, Any]:
@@ -28,6 +26,10 @@ def apply_patch(file_path: str, patch: str, dry_run: bool = False) -> Dict[str,
         - Returns same format as normal apply
         - Useful for safe automation and pre-flight checks
 
+    Empty Patches:
+        - An empty or whitespace-only patch succeeds immediately as a no-op
+        - The file is not accessed in that case
+
     Security:
         - Validates file safety (no symlinks, no binaries)
         - Checks disk space before modification
@@ -68,11 +70,41 @@ def apply_patch(file_path: str, patch: str, dry_run: bool = False) -> Dict[str,
         ...     # Now apply for real
         ...     result = apply_patch("config.py", patch)
     """
-    path = Path(file_path)
+    return _apply_patch(Path(file_path), patch, dry_run)
+
+
+def _apply_patch(
+    path: Path, patch: str, dry_run: bool = False, reverse: bool = False
+) -> Dict[str, Any]:
+    """Apply a patch, or its inverse, to a file.
+
+    Shared implementation of apply_patch and revert_patch. With reverse=True the
+    patch is inverted while it is parsed, so no reversed copy of it is built.
+
+    Args:
+        path: Path to the file to patch
+        patch: Unified diff patch content
+        dry_run: If True, validate only without modifying file
+        reverse: If True, apply the patch in reverse
+
+    Returns:
+        Same result dict as apply_patch
+    """
+    # Empty patch is a no-op - return before touching the filesystem
+    if not patch or not patch.strip():
+        return {
+            "success": True,
+            "file_path": str(path),
+            "applied": True,
+            "changes": {"lines_added": 0, "lines_removed": 0, "hunks_applied": 0},
+            "message": "Empty patch - no changes to apply",
+        }
 
     # Security checks
     # For dry_run, we don't need write or space checks
-    safety_error = validate_file_safety(path, check_write=not dry_run, check_space=not dry_run)
+    safety_error = check_patch_size(patch) or validate_file_safety(
+        path, check_write=not dry_run, check_space=not dry_run
+    )
     if safety_error:
         return {
             "success": False,
@@ -81,8 +113,20 @@ def apply_patch(file_path: str, patch: str, dry_run: bool = False) -> Dict[str,
             **safety_error,
         }
 
-    # Validate patch can be applied
-    validation = validate_patch(str(path), patch)
+    # Read the file once; validation and the edit below share the same bytes
+    try:
+        original_content = read_file_bytes(path)
+    except OSError as e:
+        return {
+            "success": False,
+            "file_path": str(path),
+            "applied": False,
+            "error": f"I/O error: {str(e)}",
+            "error_type": "io_error",
+        }
+
+    # Validate patch can be applied (file safety was already checked above)
+    validation = _validate_checked_file(path, patch, reverse=reverse, content=original_content)
 
     if not validation["success"]:
         # Patch cannot be applied
@@ -114,31 +158,18 @@ def apply_patch(file_path: str, patch: str, dry_run: bool = False) -> Dict[str,
 
     # Apply the patch for real
     try:
-        # Read original file
-        with open(path, "r", encoding="utf-8") as f:
-            original_lines = f.readlines()
+        # Validation has already checked the content decodes as UTF-8; untouched
+        # lines are copied through as bytes without a decode/encode round-trip
+        original_lines = original_content.splitlines(keepends=True)
 
         # Parse patch and apply changes
-        modified_lines = _apply_patch_to_lines(original_lines, patch)
-
-        # Write to temporary file first (using secure temp file creation)
-        temp_fd, temp_path_str = tempfile.mkstemp(
-            dir=path.parent, prefix=".patch_tmp_", suffix=".tmp", text=True
-        )
-        temp_file = Path(temp_path_str)
-        try:
-            # Write to the temp file using the file descriptor
-            with os.fdopen(temp_fd, "w", encoding="utf-8") as f:
-                f.writelines(modified_lines)
-
-            # Atomically replace original file
-            atomic_file_replace(temp_file, path)
-
-        except Exception:
-            # Clean up temp file on error
-            if temp_file.exists():
-                temp_file.unlink()
-            raise
+        modified_lines = _apply_patch_to_lines(original_lines, patch, reverse=reverse)
+        modified_content = b"".join(modified_lines)
+
+        # Write via a temporary file and atomically replace the original. A patch that
+        # leaves the content byte-identical skips the write, keeping the file's mtime
+        if modified_content != original_content:
+            atomic_file_write(path, modified_content)
 
         return {
             "success": True,
@@ -148,14 +179,6 @@ def apply_patch(file_path: str, patch: str, dry_run: bool = False) -> Dict[str,
             "message": f"Successfully applied patch to {path.name}",
         }
 
-    except UnicodeDecodeError as e:
-        return {
-            "success": False,
-            "file_path": str(path),
-            "applied": False,
-            "error": f"Cannot decode file as UTF-8: {str(e)}",
-            "error_type": "encoding_error",
-        }
     except OSError as e:
         return {
             "success": False,
@@ -174,12 +197,15 @@ def apply_patch(file_path: str, patch: str, dry_run: bool = False) -> Dict[str,
         }
 
 
-def _apply_patch_to_lines(original_lines: list[str], patch: str) -> list[str]:
+def _apply_patch_to_lines(
+    original_lines: list[bytes], patch: str, reverse: bool = False
+) -> list[bytes]:
     """Apply patch to lines and return modified lines.
 
     Args:
-        original_lines: Original file lines
+        original_lines: Original file lines (raw bytes, line endings included)
         patch: Patch content
+        reverse: If True, apply the patch in reverse
 
     Returns:
         Modified lines after applying patch
@@ -187,106 +213,81 @@ def _apply_patch_to_lines(original_lines: list[str], patch: str) -> list[str]:
     Raises:
         ValueError: If patch cannot be applied
     """
-    # Parse patch into hunks
-    hunks = _parse_patch_hunks(patch)
+    # Parse patch into hunks - a cache hit after the validation in _apply_patch
+    hunks = _parsed_patch(patch, reverse=reverse)["hunks"]
 
     if not hunks:
         # Empty patch - return original lines
         return original_lines
 
-    # Apply hunks in reverse order (to maintain line numbers)
-    result_lines = original_lines.copy()
+    if len(hunks) == 1:
+        # Common case: a single edit needs no sorting or copy loop
+        start_idx, end_idx, new_section = _hunk_edit(hunks[0], original_lines)
+        return original_lines[:start_idx] + new_section + original_lines[end_idx:]
 
-    # Sort hunks by starting line (descending) to apply from bottom to top
-    sorted_hunks = sorted(hunks, key=lambda h: h["source_start"], reverse=True)
+    # Each hunk is an edit in original line numbers; sort by position and assemble
+    # the output in one forward pass instead of re-slicing the file once per hunk
+    edits = sorted((_hunk_edit(hunk, original_lines) for hunk in hunks), key=lambda edit: edit[0])
 
-    for hunk in sorted_hunks:
-        result_lines = _apply_single_hunk(result_lines, hunk)
+    result_lines: list[bytes] = []
+    copied_up_to = 0
+    for start_idx, end_idx, new_section in edits:
+        result_lines.extend(original_lines[copied_up_to:start_idx])
+        result_lines.extend(new_section)
+        copied_up_to = end_idx
+    result_lines.extend(original_lines[copied_up_to:])
 
     return result_lines
 
 
-def _parse_patch_hunks(patch: str) -> list[Dict[str, Any]]:
-    """Parse patch into hunk structures.
+def _hunk_edit(hunk: _Hunk, original_lines: list[bytes]) -> tuple[int, int, list[bytes]]:
+    """Convert a hunk into a line-range replacement.
+
+    Patch lines are LF-terminated; the replacement lines take the line ending of
+    the region they replace, so CRLF and CR files keep a single line ending.
 
     Args:
-        patch: Patch content
+        hunk: Hunk to convert
+        original_lines: Original file lines (raw bytes, line endings included)
 
     Returns:
-        List of hunk dictionaries
+        Tuple of (start_idx, end_idx, new_section): the 0-based, end-exclusive
+        range of original lines the hunk covers and the lines that replace it
     """
-    hunks: list[Dict[str, Any]] = []
-    current_hunk: Dict[str, Any] | None = None
-    lines = patch.split("\n")
-
-    for line in lines:
-        if line.startswith("@@"):
-            # New hunk
-            parts = line.split("@@")[1].strip().split()
-            if len(parts) >= 2:
-                # Parse source range
-                source_part = parts[0][1:].split(",")  # Remove '-'
-                source_start = int(source_part[0])
-                source_count = int(source_part[1]) if len(source_part) > 1 else 1
-
-                current_hunk = {
-                    "source_start": source_start,
-                    "source_count": source_count,
-                    "lines": [],
-                }
-                hunks.append(current_hunk)
-        elif current_hunk is not None:
-            # Add line to current hunk
-            if line.startswith("+") and not line.startswith("+++"):
-                current_hunk["lines"].append(("add", line[1:]))
-            elif line.startswith("-") and not line.startswith("---"):
-                current_hunk["lines"].append(("remove", line[1:]))
-            elif line.startswith(" "):
-                current_hunk["lines"].append(("context", line[1:]))
-            elif line.startswith("\\"):
-                # "\ No newline at end of file" - skip
-                pass
-
-    return hunks
-
-
-def _apply_single_hunk(lines: list[str], hunk: Dict[str, Any]) -> list[str]:
-    """Apply a single hunk to lines.
+    # Convert to 0-based index
+    start_idx = hunk.source_start - 1
+    end_idx = start_idx + hunk.source_count
+
+    # The new content for this section is the hunk's context and added lines;
+    # removed lines are dropped
+    new_section = list(hunk.new_lines)
+
+    ending = _line_ending(original_lines, start_idx, end_idx)
+    if ending != b"\n":
+        new_section = [line[:-1] + ending for line in new_section]
+
+    return start_idx, end_idx, new_section
+
+
+def _line_ending(original_lines: list[bytes], start_idx: int, end_idx: int) -> bytes:
+    """Find the line ending used around a range of lines.
 
     Args:
-        lines: Current file lines
-        hunk: Hunk to apply
+        original_lines: Original file lines (raw bytes, line endings included)
+        start_idx: 0-based start of the range
+        end_idx: 0-based, end-exclusive end of the range
 
     Returns:
-        Modified lines
-
-    Raises:
-        ValueError: If hunk cannot be applied
+        The ending of the first terminated line in the range, falling back to
+        the lines just before and after it (an empty range or an unterminated
+        last line), and to LF when the file has no line ending at all
     """
-    # Convert to 0-based index
-    start_idx = hunk["source_start"] - 1
-
-    # Build new content for this section
-    new_section = []
-    original_idx = start_idx
-    hunk_lines = hunk["lines"]
-
-    for action, content in hunk_lines:
-        if action == "context":
-            # Context line - should match original
-            new_section.append(content + "\n")
-            original_idx += 1
-        elif action == "remove":
-            # Remove line - skip it (don't add to new_section)
-            original_idx += 1
-        elif action == "add":
-            # Add line
-            new_section.append(content + "\n")
-
-    # Calculate how many lines to replace
-    lines_to_replace = hunk["source_count"]
-
-    # Replace the section
-    result = lines[:start_idx] + new_section + lines[start_idx + lines_to_replace :]
-
-    return result
+    neighbours = original_lines[max(start_idx - 1, 0) : end_idx + 1]
+    for line in original_lines[start_idx:end_idx] + neighbours:
+        if line.endswith(b"\r\n"):
+            return b"\r\n"
+        if line.endswith(b"\n"):
+            return b"\n"
+        if line.endswith(b"\r"):
+            return b"\r"
+    return b"\n"
@@ -14,6 +14,9 @@ from typing import Any, Dict, Optional
 
 from ..utils import atomic_file_replace, validate_file_safety
 
+# Backup filename format: {original}.backup.YYYYMMDD_HHMMSS
+BACKUP_NAME_PATTERN = re.compile(r"^(.+)\.backup\.\d{8}_\d{6}$")
+
 
 def backup_file(file_path: str) -> Dict[str, Any]:
     """Create a timestamped backup copy of a file.
@@ -188,8 +191,7 @@ def parse_backup_filename(backup_file: str) -> Optional[str]:
     backup_path = Path(backup_file)
 
     # Check if filename matches pattern: *.backup.YYYYMMDD_HHMMSS
-    pattern = r"^(.+)\.backup\.\d{8}_\d{6}$"
-    match = re.match(pattern, backup_path.name)
+    match = BACKUP_NAME_PATTERN.match(backup_path.name)
 
     if match:
         # Extract original filename
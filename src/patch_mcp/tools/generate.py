@@ -107,30 +107,32 @@ def generate_patch(
             "error_type": "io_error",
         }
 
-    # Generate unified diff
-    diff_lines = list(
-        difflib.unified_diff(
-            original_lines,
-            modified_lines,
-            fromfile=original_path.name,
-            tofile=modified_path.name,
-            n=context_lines,
-            lineterm="",
-        )
-    )
-
-    # Join with newlines and add final newline if content exists
-    if diff_lines:
-        patch = "\n".join(diff_lines) + "\n"
-    else:
-        patch = ""
+    # Identical files: the answer is known, skip difflib and the sensitive-content scan
+    if original_lines == modified_lines:
+        return {
+            "success": True,
+            "original_file": str(original_path),
+            "modified_file": str(modified_path),
+            "patch": "",
+            "changes": {"lines_added": 0, "lines_removed": 0, "hunks": 0},
+            "message": "Files are identical - no patch generated",
+        }
 
-    # Count changes
+    # Generate unified diff, counting changes as the lines are produced
+    diff_lines: list[str] = []
     lines_added = 0
     lines_removed = 0
     hunks = 0
 
-    for line in diff_lines:
+    for line in difflib.unified_diff(
+        original_lines,
+        modified_lines,
+        fromfile=original_path.name,
+        tofile=modified_path.name,
+        n=context_lines,
+        lineterm="",
+    ):
+        diff_lines.append(line)
         if line.startswith("@@"):
             hunks += 1
         elif line.startswith("+") and not line.startswith("+++"):
@@ -138,15 +140,16 @@ def generate_patch(
         elif line.startswith("-") and not line.startswith("---"):
             lines_removed += 1
 
+    # Join with newlines and add final newline if content exists
+    if diff_lines:
+        patch = "\n".join(diff_lines) + "\n"
+    else:
+        patch = ""
+
     # Scan patch for sensitive content
     security_scan = detect_sensitive_content(patch)
 
-    # Return result
-    if hunks == 0:
-        message = "Files are identical - no patch generated"
-    else:
-        message = "Generated patch from file comparison"
-
+    # Return result (identical files returned early above, so there is a hunk)
     result = {
         "success": True,
         "original_file": str(original_path),
@@ -157,7 +160,7 @@ def generate_patch(
             "lines_removed": lines_removed,
             "hunks": hunks,
         },
-        "message": message,
+        "message": "Generated patch from file comparison",
     }
 
     # Add security warning if sensitive content detected
@@ -9,6 +9,8 @@ CRITICAL: Supports multi-file patches (returns files array, not file object).
 import re
 from typing import Any, Dict, List
 
+from ..utils import check_patch_size
+
 # Regex patterns for parsing unified diff format
 HEADER_PATTERN = re.compile(r"^---\s+(.+?)(?:\t|\s|$)", re.MULTILINE)
 HUNK_PATTERN = re.compile(r"^@@\s+-(\d+)(?:,(\d+))?\s+\+(\d+)(?:,(\d+))?\s+@@", re.MULTILINE)
@@ -60,6 +62,14 @@ def inspect_patch(patch: str) -> Dict[str, Any]:
                 "message": str
             }
 
+        Dict with the following structure on an oversized patch:
+            {
+                "success": False,
+                "error": str,
+                "error_type": "resource_limit",
+                "message": str
+            }
+
     Example:
         >>> result = inspect_patch(patch_content)
         >>> if result["success"]:
@@ -82,6 +92,10 @@ def inspect_patch(patch: str) -> Dict[str, Any]:
             "message": "Empty patch - no changes",
         }
 
+    size_error = check_patch_size(patch)
+    if size_error:
+        return {"success": False, **size_error, "message": "Patch exceeds size limit"}
+
     # Parse the patch into file sections
     file_sections = _split_into_file_sections(patch)
 
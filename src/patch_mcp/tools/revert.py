@@ -1,8 +1,7 @@
 """Revert patch tool - reverse previously applied patches.
 
 This module implements the revert_patch tool which reverts a previously
-applied patch by reversing it (swapping additions and removals) and applying
-the reversed patch.
+applied patch by applying it in reverse (additions and removals swap roles).
 
 CRITICAL: Use the EXACT same patch that was originally applied.
 """
@@ -10,20 +9,21 @@ CRITICAL: Use the EXACT same patch that was originally applied.
 from pathlib import Path
 from typing import Any, Dict
 
-from .apply import apply_patch
+from .apply import _apply_patch
 
 
 def revert_patch(file_path: str, patch: str) -> Dict[str, Any]:
     """Revert a previously applied patch (apply in reverse).
 
     Takes a patch and applies it in reverse to undo the changes it made.
-    This works by swapping the + and - lines in the patch and then applying
-    the reversed patch.
+    The + and - lines (and the hunk ranges) swap roles while the patch is
+    parsed, so no reversed copy of the patch is built.
 
     IMPORTANT:
         - Use the EXACT same patch that was originally applied
         - The file must not have been modified in the affected areas
         - If the file has changed, revert will fail with context mismatch
+        - An empty patch succeeds immediately without accessing the file
 
     Args:
         file_path: Path to the file to revert
@@ -61,11 +61,18 @@ def revert_patch(file_path: str, patch: str) -> Dict[str, Any]:
     """
     path = Path(file_path)
 
-    # Reverse the patch (swap + and -)
-    reversed_patch = _reverse_patch(patch)
+    # Empty patch is a no-op - return before touching the filesystem
+    if not patch or not patch.strip():
+        return {
+            "success": True,
+            "file_path": str(path),
+            "reverted": True,
+            "changes": {"lines_added": 0, "lines_removed": 0, "hunks_reverted": 0},
+            "message": "Empty patch - nothing to revert",
+        }
 
-    # Apply the reversed patch
-    result = apply_patch(str(path), reversed_patch)
+    # Apply the patch in reverse (swap + and -)
+    result = _apply_patch(path, patch, reverse=True)
 
     # Transform the result to use "reverted" terminology
     if result["success"]:
@@ -96,78 +103,3 @@ def revert_patch(file_path: str, patch: str) -> Dict[str, Any]:
             "error": error_msg,
             "error_type": result.get("error_type", "context_mismatch"),
         }
-
-
-def _reverse_patch(patch: str) -> str:
-    """Reverse a patch by swapping additions and removals.
-
-    This swaps:
-        - Lines starting with "+" to start with "-"
-        - Lines starting with "-" to start with "+"
-        - Source and target line numbers in hunk headers
-        - File headers (--- and +++) stay the same to target the same file
-
-    Args:
-        patch: Original patch
-
-    Returns:
-        Reversed patch
-    """
-    if not patch or not patch.strip():
-        return patch
-
-    lines = patch.split("\n")
-    reversed_lines = []
-
-    for line in lines:
-        if line.startswith("--- ") or line.startswith("+++ "):
-            # Keep file headers as-is (same file)
-            reversed_lines.append(line)
-        elif line.startswith("@@ "):
-            # Reverse the hunk header (swap source and target ranges)
-            reversed_lines.append(_reverse_hunk_header(line))
-        elif line.startswith("+") and not line.startswith("+++"):
-            # Change + to -
-            reversed_lines.append("-" + line[1:])
-        elif line.startswith("-") and not line.startswith("---"):
-            # Change - to +
-            reversed_lines.append("+" + line[1:])
-        else:
-            # Context lines and other lines remain the same
-            reversed_lines.append(line)
-
-    return "\n".join(reversed_lines)
-
-
-def _reverse_hunk_header(header: str) -> str:
-    """Reverse a hunk header by swapping source and target ranges.
-
-    Args:
-        header: Original hunk header (e.g., "@@ -1,3 +1,4 @@")
-
-    Returns:
-        Reversed hunk header (e.g., "@@ -1,4 +1,3 @@")
-    """
-    # Extract the parts between @@
-    try:
-        parts = header.split("@@")
-        if len(parts) < 3:
-            return header
-
-        ranges = parts[1].strip().split()
-        if len(ranges) < 2:
-            return header
-
-        # Swap source (-) and target (+) ranges
-        source_range = ranges[0]  # e.g., "-1,3"
-        target_range = ranges[1]  # e.g., "+1,4"
-
-        # Swap the prefixes
-        new_source = "+" + source_range[1:]  # "-1,3" -> "+1,3"
-        new_target = "-" + target_range[1:]  # "+1,4" -> "-1,4"
-
-        # Reconstruct header
-        return f"@@ {new_target} {new_source} @@"
-    except Exception:
-        # If parsing fails, return original
-        return header
@@ -9,11 +9,44 @@ CRITICAL: Return value semantics
     - Always includes error_type when success=False
 """
 
-import difflib
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Sequence
 
-from ..utils import sanitize_error_message, validate_file_safety
+from ..utils import (
+    check_patch_size,
+    read_file_bytes,
+    sanitize_error_message,
+    validate_file_safety,
+)
+
+# Canonical unified diff hunk header: @@ -start[,count] +start[,count] @@
+HUNK_HEADER_PATTERN = re.compile(r"@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Result messages, shared by every return path that reports them
+_MSG_CAN_APPLY = "Patch is valid and can be applied cleanly"
+_MSG_CANNOT_APPLY = "Patch is valid but cannot be applied to this file"
+
+# Larger patches are parsed on every call instead of being kept in the parse cache,
+# bounding the memory a long-running server retains
+PARSE_CACHE_MAX_PATCH_SIZE = 64 * 1024
+
+
+class _Hunk(NamedTuple):
+    """One parsed hunk. Immutable, since parse results are cached and shared."""
+
+    source_start: int
+    source_count: int
+    target_start: int
+    target_count: int
+    # Context and removed lines in patch order, UTF-8 encoded - what the file
+    # must contain at source_start
+    old_lines: tuple[bytes, ...]
+    # Context and added lines in patch order, UTF-8 encoded with a trailing
+    # newline, ready to be spliced into the file
+    new_lines: tuple[bytes, ...]
 
 
 def validate_patch(file_path: str, patch: str) -> Dict[str, Any]:
@@ -24,7 +57,8 @@ def validate_patch(file_path: str, patch: str) -> Dict[str, Any]:
         2. Patch format validity
         3. Context lines match file content exactly
 
-    This is a READ-ONLY operation - the file is never modified.
+    This is a READ-ONLY operation - the file is never modified. An empty or
+    whitespace-only patch is valid and succeeds without accessing the file.
 
     Return Value Semantics (CRITICAL):
         - success=True: Patch CAN be applied cleanly
@@ -84,8 +118,26 @@ def validate_patch(file_path: str, patch: str) -> Dict[str, Any]:
     """
     path = Path(file_path)
 
+    # Empty patch is a no-op - return before touching the filesystem
+    if not patch or not patch.strip():
+        return {
+            "success": True,
+            "file_path": str(path),
+            "valid": True,
+            "can_apply": True,
+            "preview": {
+                "lines_to_add": 0,
+                "lines_to_remove": 0,
+                "hunks": 0,
+                "affected_line_range": {"start": 1, "end": 1},
+            },
+            "message": _MSG_CAN_APPLY,
+        }
+
     # Security checks (read-only, no write or space checks needed)
-    safety_error = validate_file_safety(path, check_write=False, check_space=False)
+    safety_error = check_patch_size(patch) or validate_file_safety(
+        path, check_write=False, check_space=False
+    )
     if safety_error:
         return {
             "success": False,
@@ -93,10 +145,36 @@ def validate_patch(file_path: str, patch: str) -> Dict[str, Any]:
             **safety_error,
         }
 
-    # Read file content
+    return _validate_checked_file(path, patch)
+
+
+def _validate_checked_file(
+    path: Path, patch: str, reverse: bool = False, content: Optional[bytes] = None
+) -> Dict[str, Any]:
+    """Validate a patch against a file that has already passed validate_file_safety.
+
+    Lets callers that run their own (stricter) safety checks, such as apply_patch,
+    skip a second stat and binary-sniff read of the same file.
+
+    Args:
+        path: Path to the file to validate against
+        patch: Unified diff patch content to validate
+        reverse: If True, validate the inverse of the patch (see _parse_patch)
+        content: Raw file content if the caller has already read it; the file
+            is read here otherwise
+
+    Returns:
+        Same result dict as validate_patch
+    """
+    # Read file content once as bytes, then decode it in memory
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            file_lines = f.readlines()
+        if content is None:
+            content = read_file_bytes(path)
+        # Lines are matched as bytes; the decode only checks the file is UTF-8
+        content.decode("utf-8")
+        # bytes.splitlines() breaks only on \n, \r\n and \r - the same universal
+        # newlines a text-mode read uses
+        file_lines = content.splitlines()
     except UnicodeDecodeError as e:
         return {
             "success": False,
@@ -113,7 +191,7 @@ def validate_patch(file_path: str, patch: str) -> Dict[str, Any]:
         }
 
     # Parse and validate patch format
-    parse_result = _parse_patch(patch)
+    parse_result = _parsed_patch(patch, reverse=reverse)
     if not parse_result["valid"]:
         return {
             "success": False,
@@ -132,8 +210,8 @@ def validate_patch(file_path: str, patch: str) -> Dict[str, Any]:
 
     # Build preview
     if hunks:
-        min_line = min(h["target_start"] for h in hunks)
-        max_line = max(h["target_start"] + h["target_count"] - 1 for h in hunks)
+        min_line = min(h.target_start for h in hunks)
+        max_line = max(h.target_start + h.target_count - 1 for h in hunks)
         affected_range = {"start": min_line, "end": max(max_line, min_line)}
     else:
         affected_range = {"start": 1, "end": 1}
@@ -153,7 +231,7 @@ def validate_patch(file_path: str, patch: str) -> Dict[str, Any]:
             "valid": True,
             "can_apply": True,
             "preview": preview,
-            "message": "Patch is valid and can be applied cleanly",
+            "message": _MSG_CAN_APPLY,
         }
     else:
         # FAILURE: Patch cannot be applied (context mismatch)
@@ -166,20 +244,57 @@ def validate_patch(file_path: str, patch: str) -> Dict[str, Any]:
             "preview": preview,
             "reason": validation["reason"],
             "error_type": "context_mismatch",
-            "message": "Patch is valid but cannot be applied to this file",
+            "message": _MSG_CANNOT_APPLY,
         }
 
 
-def _parse_patch(patch: str) -> Dict[str, Any]:
+def _parsed_patch(patch: str, reverse: bool = False) -> Mapping[str, Any]:
+    """Parse a patch, through the parse cache unless it is too large to keep.
+
+    This is the single parser entry point behind validate_patch, apply_patch and
+    revert_patch, so a validate_patch followed by an apply_patch of the same
+    patch parses it once.
+
+    Args:
+        patch: Patch content to parse
+        reverse: If True, parse the patch as its inverse (see _read_patch)
+
+    Returns:
+        Read-only parse result, see _read_patch
+    """
+    if len(patch) > PARSE_CACHE_MAX_PATCH_SIZE:
+        return MappingProxyType(_read_patch(patch, reverse))
+    return _parse_patch(patch, reverse)
+
+
+@lru_cache(maxsize=32)
+def _parse_patch(patch: str, reverse: bool = False) -> Mapping[str, Any]:
+    """Parse a patch and cache the result by patch text.
+
+    The result is shared between callers, so it is returned read-only.
+
+    Args:
+        patch: Patch content to parse
+        reverse: If True, parse the patch as its inverse (see _read_patch)
+
+    Returns:
+        Read-only parse result, see _read_patch
+    """
+    return MappingProxyType(_read_patch(patch, reverse))
+
+
+def _read_patch(patch: str, reverse: bool = False) -> Dict[str, Any]:
     """Parse patch format and extract hunks.
 
     Args:
         patch: Patch content to parse
+        reverse: If True, parse the patch as its inverse - added and removed
+            lines swap, as do the source and target ranges of each hunk
 
     Returns:
         Dict with:
             - valid: bool
-            - hunks: List of hunk info (if valid)
+            - hunks: Tuple of _Hunk (if valid)
             - lines_to_add: int
             - lines_to_remove: int
             - error: str (if invalid)
@@ -187,21 +302,49 @@ def _parse_patch(patch: str) -> Dict[str, Any]:
     if not patch or not patch.strip():
         return {
             "valid": True,
-            "hunks": [],
+            "hunks": (),
             "lines_to_add": 0,
             "lines_to_remove": 0,
         }
 
     lines = patch.split("\n")
     hunks: list[Dict[str, Any]] = []
+    # Patch line number of each hunk's header, for error messages
+    header_lines: list[int] = []
     current_hunk: Dict[str, Any] | None = None
     lines_to_add = 0
     lines_to_remove = 0
     found_header = False
+    # Reversing only changes which line prefix counts as an addition
+    add_prefix, remove_prefix = ("-", "+") if reverse else ("+", "-")
+
+    # Repeated lines (blank lines, closing braces, ...) are encoded once and all
+    # occurrences share a single bytes object - one pool for the bare lines matched
+    # against the file, one for the newline-terminated lines spliced into it
+    encoded_lines: Dict[str, bytes] = {}
+    terminated_lines: Dict[str, bytes] = {}
+
+    def encode(text: str) -> bytes:
+        encoded = encoded_lines.get(text)
+        if encoded is None:
+            encoded = encoded_lines[text] = text.encode("utf-8")
+        return encoded
+
+    def encode_terminated(text: str) -> bytes:
+        terminated = terminated_lines.get(text)
+        if terminated is None:
+            terminated = terminated_lines[text] = encode(text) + b"\n"
+        return terminated
 
     for i, line in enumerate(lines):
-        # Check for file headers
-        if line.startswith("---"):
+        # Dispatch on the first character. Context lines are the most common and can
+        # never be a header, so they are classified before any header check
+        first = line[:1]
+        if first == " ":
+            if current_hunk is not None:
+                current_hunk["old_lines"].append(encode(line[1:]))
+                current_hunk["new_lines"].append(encode_terminated(line[1:]))
+        elif line.startswith("---"):
             found_header = True
         elif line.startswith("+++"):
             if not found_header:
@@ -210,86 +353,147 @@ def _parse_patch(patch: str) -> Dict[str, Any]:
                     "error": f"Invalid patch format: +++ before --- at line {i+1}",
                 }
         elif line.startswith("@@"):
+            # A hunk without a preceding file header can never become valid - stop
+            # here instead of scanning the rest of the patch
+            if not found_header:
+                return {
+                    "valid": False,
+                    "error": "Invalid patch format: missing --- header",
+                }
+
             # Parse hunk header
             # Format: @@ -source_start,source_count +target_start,target_count @@
-            try:
-                parts = line.split("@@")[1].strip().split()
-                if len(parts) < 2:
+            if match := HUNK_HEADER_PATTERN.match(line):
+                # Fast path: canonical header, one precompiled regex match
+                source_start, source_count, target_start, target_count = _hunk_ranges(match)
+            else:
+                # Non-canonical header - parse field by field for a precise error
+                try:
+                    parts = line.split("@@")[1].strip().split()
+                    if len(parts) < 2:
+                        return {
+                            "valid": False,
+                            "error": f"Invalid hunk header at line {i+1}",
+                        }
+
+                    # Parse source range (-start,count)
+                    source_part = parts[0]
+                    if not source_part.startswith("-"):
+                        return {
+                            "valid": False,
+                            "error": f"Invalid source range at line {i+1}",
+                        }
+                    source_parts = source_part[1:].split(",")
+                    source_start = int(source_parts[0])
+                    source_count = int(source_parts[1]) if len(source_parts) > 1 else 1
+
+                    # Parse target range (+start,count)
+                    target_part = parts[1]
+                    if not target_part.startswith("+"):
+                        return {
+                            "valid": False,
+                            "error": f"Invalid target range at line {i+1}",
+                        }
+                    target_parts = target_part[1:].split(",")
+                    target_start = int(target_parts[0])
+                    target_count = int(target_parts[1]) if len(target_parts) > 1 else 1
+                except (ValueError, IndexError) as e:
                     return {
                         "valid": False,
-                        "error": f"Invalid hunk header at line {i+1}",
+                        "error": f"Cannot parse hunk header at line {i+1}: {str(e)}",
                     }
 
-                # Parse source range (-start,count)
-                source_part = parts[0]
-                if not source_part.startswith("-"):
-                    return {
-                        "valid": False,
-                        "error": f"Invalid source range at line {i+1}",
-                    }
-                source_parts = source_part[1:].split(",")
-                source_start = int(source_parts[0])
-                source_count = int(source_parts[1]) if len(source_parts) > 1 else 1
+            if reverse:
+                source_start, source_count, target_start, target_count = (
+                    target_start,
+                    target_count,
+                    source_start,
+                    source_count,
+                )
 
-                # Parse target range (+start,count)
-                target_part = parts[1]
-                if not target_part.startswith("+"):
-                    return {
-                        "valid": False,
-                        "error": f"Invalid target range at line {i+1}",
-                    }
-                target_parts = target_part[1:].split(",")
-                target_start = int(target_parts[0])
-                target_count = int(target_parts[1]) if len(target_parts) > 1 else 1
-
-                current_hunk = {
-                    "source_start": source_start,
-                    "source_count": source_count,
-                    "target_start": target_start,
-                    "target_count": target_count,
-                    "context_lines": [],
-                    "added_lines": [],
-                    "removed_lines": [],
-                }
-                hunks.append(current_hunk)
-            except (ValueError, IndexError) as e:
-                return {
-                    "valid": False,
-                    "error": f"Cannot parse hunk header at line {i+1}: {str(e)}",
-                }
+            current_hunk = {
+                "source_start": source_start,
+                "source_count": source_count,
+                "target_start": target_start,
+                "target_count": target_count,
+                "old_lines": [],
+                "new_lines": [],
+            }
+            hunks.append(current_hunk)
+            header_lines.append(i + 1)
         elif current_hunk is not None:
             # Inside a hunk - collect lines
-            if line.startswith("+") and not line.startswith("+++"):
-                current_hunk["added_lines"].append(line[1:])
+            if first == add_prefix and not line.startswith(add_prefix * 3):
+                current_hunk["new_lines"].append(encode_terminated(line[1:]))
                 lines_to_add += 1
-            elif line.startswith("-") and not line.startswith("---"):
-                current_hunk["removed_lines"].append(line[1:])
+            elif first == remove_prefix and not line.startswith(remove_prefix * 3):
+                current_hunk["old_lines"].append(encode(line[1:]))
                 lines_to_remove += 1
-            elif line.startswith(" "):
-                current_hunk["context_lines"].append(line[1:])
-            elif line.startswith("\\"):
-                # "\ No newline at end of file" - skip
-                pass
-
-    if not found_header and hunks:
-        return {
-            "valid": False,
-            "error": "Invalid patch format: missing --- header",
-        }
+            # Anything else ("\ No newline at end of file", blank lines) is skipped
+
+    # Freeze the collected hunks - the result may be cached and shared between callers
+    frozen_hunks = tuple(
+        _Hunk(
+            source_start=h["source_start"],
+            source_count=h["source_count"],
+            target_start=h["target_start"],
+            target_count=h["target_count"],
+            old_lines=tuple(h["old_lines"]),
+            new_lines=tuple(h["new_lines"]),
+        )
+        for h in hunks
+    )
+
+    # A body that disagrees with its header's counts would make apply replace lines
+    # the hunk never matched (or leave lines it should have replaced)
+    for hunk, header_line in zip(frozen_hunks, header_lines):
+        if len(hunk.old_lines) != hunk.source_count or len(hunk.new_lines) != hunk.target_count:
+            return {
+                "valid": False,
+                "error": (
+                    f"Invalid patch format: hunk at line {header_line} has "
+                    f"{len(hunk.old_lines)} source and {len(hunk.new_lines)} target "
+                    f"lines but its header declares {hunk.source_count} and "
+                    f"{hunk.target_count}"
+                ),
+            }
 
     return {
         "valid": True,
-        "hunks": hunks,
+        "hunks": frozen_hunks,
         "lines_to_add": lines_to_add,
         "lines_to_remove": lines_to_remove,
     }
 
 
-def _can_apply_patch(file_lines: list[str], hunks: list[Dict[str, Any]]) -> Dict[str, Any]:
+def _hunk_ranges(match: "re.Match[str]") -> tuple[int, int, int, int]:
+    """Extract source/target ranges from a HUNK_HEADER_PATTERN match.
+
+    Args:
+        match: Successful match of HUNK_HEADER_PATTERN
+
+    Returns:
+        Tuple of (source_start, source_count, target_start, target_count);
+        an omitted count defaults to 1
+    """
+    source_start, source_count, target_start, target_count = match.groups()
+    return (
+        int(source_start),
+        int(source_count) if source_count is not None else 1,
+        int(target_start),
+        int(target_count) if target_count is not None else 1,
+    )
+
+
+def _can_apply_patch(file_lines: list[bytes], hunks: Sequence[_Hunk]) -> Dict[str, Any]:
     """Check if patch hunks can be applied to file.
 
+    Each hunk's context and removed lines are compared, as UTF-8 bytes, with the
+    file lines at the hunk's position. The check stops at the first differing
+    line and names it in the reason.
+
     Args:
-        file_lines: Lines from the target file
+        file_lines: Raw lines from the target file, without line endings
         hunks: Parsed hunk information
 
     Returns:
@@ -303,12 +507,12 @@ def _can_apply_patch(file_lines: list[str], hunks: list[Dict[str, Any]]) -> Dict
 
     for hunk in hunks:
         # Get the section of the file this hunk affects
-        start_line = hunk["source_start"] - 1  # Convert to 0-indexed
-        end_line = start_line + hunk["source_count"]
+        start_line = hunk.source_start - 1  # Convert to 0-indexed
+        end_line = start_line + hunk.source_count
 
         if start_line < 0 or end_line > len(file_lines):
             reason = (
-                f"Hunk refers to lines {hunk['source_start']}-{end_line} "
+                f"Hunk refers to lines {hunk.source_start}-{end_line} "
                 f"but file only has {len(file_lines)} lines"
             )
             return {
@@ -316,39 +520,61 @@ def _can_apply_patch(file_lines: list[str], hunks: list[Dict[str, Any]]) -> Dict
                 "reason": reason,
             }
 
-        # Extract the actual lines from the file
-        actual_lines = file_lines[start_line:end_line]
-        actual_content_clean = [line.rstrip("\n") for line in actual_lines]
-
-        # Check if removed lines exist in the actual content
-        for removed_line in hunk["removed_lines"]:
-            clean_removed = removed_line.rstrip("\n")
-            if clean_removed not in actual_content_clean:
-                # Find closest match for better error message
-                closest = difflib.get_close_matches(
-                    clean_removed, actual_content_clean, n=1, cutoff=0.6
-                )
-                if closest:
-                    reason = (
-                        f"Context mismatch at line {hunk['source_start']}: "
-                        f"expected '{clean_removed}' but found '{closest[0]}'"
-                    )
-                    # Sanitize to prevent content leakage
-                    reason = sanitize_error_message(reason)
-                    return {
-                        "can_apply": False,
-                        "reason": reason,
-                    }
-                else:
-                    reason = (
-                        f"Context mismatch: line '{clean_removed}' "
-                        "not found in file at expected position"
-                    )
-                    # Sanitize to prevent content leakage
-                    reason = sanitize_error_message(reason)
-                    return {
-                        "can_apply": False,
-                        "reason": reason,
-                    }
+        # The hunk's context and removed lines must match the file line by line.
+        # Compare the whole block at C speed and only look for the first
+        # differing line once it is known to differ
+        expected_lines = hunk.old_lines
+        actual_lines = file_lines[start_line : start_line + len(expected_lines)]
+        if tuple(actual_lines) == expected_lines:
+            continue
+
+        offset = next(
+            (
+                offset
+                for offset, (expected, actual) in enumerate(zip(expected_lines, actual_lines))
+                if expected != actual
+            ),
+            len(actual_lines),
+        )
+        expected = expected_lines[offset].decode("utf-8")
+        found = (
+            f"'{actual_lines[offset].decode('utf-8', errors='replace')}'"
+            if offset < len(actual_lines)
+            else "end of file"
+        )
+
+        # Point at the expected line if it moved elsewhere in the file - usually
+        # the hunk's line numbers have drifted
+        moved_to = _locate_line(file_lines, expected_lines[offset])
+        hint = f" (the line is at line {moved_to})" if moved_to else ""
+
+        reason = (
+            f"Context mismatch at line {start_line + offset + 1}: "
+            f"expected '{expected}' but found {found}{hint}"
+        )
+        # Sanitize to prevent content leakage
+        return {
+            "can_apply": False,
+            "reason": sanitize_error_message(reason),
+        }
 
     return {"can_apply": True}
+
+
+def _locate_line(file_lines: list[bytes], line: bytes) -> Optional[int]:
+    """Find where a line is in the file, if it occurs exactly once.
+
+    A line that occurs several times (blank lines, closing braces, ...) gives no
+    reliable position, so no line number is reported for it. Both the count and
+    the search are C-level scans comparing bytes objects.
+
+    Args:
+        file_lines: Raw lines from the target file, without line endings
+        line: Line to look for, UTF-8 encoded
+
+    Returns:
+        1-based line number of the line, or None if it is absent or not unique
+    """
+    if file_lines.count(line) != 1:
+        return None
+    return file_lines.index(line) + 1
@@ -6,17 +6,49 @@ before being performed.
 """
 
 import os
-import platform
+import re
 import shutil
+import stat
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from re import Match
+from typing import Any, Dict, Iterable, Optional
 
 # Security configuration constants
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_PATCH_SIZE = 2 * 1024 * 1024  # 2M characters
 MIN_FREE_SPACE = 100 * 1024 * 1024  # 100MB
 BINARY_CHECK_BYTES = 8192
 NON_TEXT_THRESHOLD = 0.3  # 30% non-text chars = binary
 
+# Text characters for the binary heuristic: printable ASCII + common whitespace
+_TEXT_CHARS = bytes(range(32, 127)) + b"\n\r\t\b"
+
+# Error message sanitization patterns (see sanitize_error_message)
+_QUOTED_PATTERN = re.compile(r"'([^']*)'")
+_POSIX_PATH_PATTERN = re.compile(r"/(?:[^/\s]+/)+([^/\s]+)")
+_WINDOWS_PATH_PATTERN = re.compile(r"[A-Za-z]:\\(?:[^\\:\s]+\\)+([^\\:\s]+)")
+
+# Sensitive content patterns (see detect_sensitive_content)
+_PRIVATE_KEY_PATTERN = re.compile(
+    r"-----BEGIN (RSA|DSA|EC|OPENSSH|PGP) PRIVATE KEY-----", re.IGNORECASE
+)
+_API_KEY_PATTERNS = [
+    (re.compile(r"api[_-]?key\s*[:=]\s*['\"]?[a-zA-Z0-9_\-]{20,}['\"]?", re.IGNORECASE), "API key"),
+    (re.compile(r"token\s*[:=]\s*['\"]?[a-zA-Z0-9_\-]{20,}['\"]?", re.IGNORECASE), "Token"),
+    (re.compile(r"secret\s*[:=]\s*['\"]?[a-zA-Z0-9_\-]{20,}['\"]?", re.IGNORECASE), "Secret"),
+    (re.compile(r"password\s*[:=]\s*['\"]?[^\s'\"]{8,}['\"]?", re.IGNORECASE), "Password"),
+]
+_AWS_KEY_PATTERN = re.compile(r"AKIA[0-9A-Z]{16}")
+_JWT_PATTERN = re.compile(r"eyJ[a-zA-Z0-9_-]*\.eyJ[a-zA-Z0-9_-]*\.[a-zA-Z0-9_-]*")
+_DB_PATTERNS = [
+    re.compile(r"(postgres|mysql|mongodb)://[^\s]+:[^\s]+@", re.IGNORECASE),
+    re.compile(r"Server=.*;Database=.*;User.*=.*;Password=.*", re.IGNORECASE),
+]
+
 
 def validate_file_safety(
     file_path: Path, check_write: bool = False, check_space: bool = False
@@ -29,8 +61,8 @@ def validate_file_safety(
     Security Checks:
         1. File exists and is a regular file
         2. Not a symlink (security policy - rejected)
-        3. Not a binary file (not supported)
-        4. Within file size limits (10MB max)
+        3. Within file size limits (10MB max)
+        4. Not a binary file (not supported)
         5. Write permissions (if check_write=True)
         6. Sufficient disk space (if check_space=True)
 
@@ -48,40 +80,41 @@ def validate_file_safety(
         >>> if error:
         ...     return {"success": False, **error}
     """
-    # Check file exists
-    if not file_path.exists():
+    # A single lstat() provides existence, symlink status, file type and size
+    try:
+        st = os.lstat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
         return {"error": f"File not found: {file_path}", "error_type": "file_not_found"}
-
-    # Check is regular file
-    if not file_path.is_file():
-        return {"error": f"Not a regular file: {file_path}", "error_type": "io_error"}
+    except OSError as e:
+        return {"error": f"Cannot stat file: {str(e)}", "error_type": "io_error"}
 
     # Security: Check for symlinks (security policy - always rejected)
-    if file_path.is_symlink():
+    if stat.S_ISLNK(st.st_mode):
         return {
             "error": f"Symlinks are not allowed (security policy): {file_path}",
             "error_type": "symlink_error",
         }
 
-    # Check if binary file
-    if is_binary_file(file_path):
-        return {
-            "error": f"Binary files are not supported: {file_path}",
-            "error_type": "binary_file",
-        }
-
-    # Check file size limits
-    try:
-        file_size = file_path.stat().st_size
-    except OSError as e:
-        return {"error": f"Cannot stat file: {str(e)}", "error_type": "io_error"}
+    # Check is regular file
+    if not stat.S_ISREG(st.st_mode):
+        return {"error": f"Not a regular file: {file_path}", "error_type": "io_error"}
 
+    # Check file size limits - from the lstat() result, before any byte is read
+    file_size = st.st_size
     if file_size > MAX_FILE_SIZE:
         return {
             "error": f"File too large: {file_size} bytes (max: {MAX_FILE_SIZE})",
             "error_type": "resource_limit",
         }
 
+    # Check if binary file (O_NOFOLLOW guards against a swap to a symlink after lstat)
+    head = _read_head(file_path, BINARY_CHECK_BYTES, follow_symlinks=False)
+    if head is None or _is_binary_bytes(head):
+        return {
+            "error": f"Binary files are not supported: {file_path}",
+            "error_type": "binary_file",
+        }
+
     # Check write permission if needed
     if check_write:
         if not os.access(file_path, os.W_OK):
@@ -93,8 +126,7 @@ def validate_file_safety(
     # Check disk space if needed
     if check_space:
         try:
-            disk_usage = shutil.disk_usage(file_path.parent)
-            free_space = disk_usage.free
+            free_space = _free_disk_space(str(file_path.parent), int(time.monotonic()))
 
             if free_space < MIN_FREE_SPACE:
                 return {
@@ -115,6 +147,80 @@ def validate_file_safety(
     return None  # All checks passed
 
 
+def check_patch_size(patch: str) -> Optional[Dict[str, Any]]:
+    """Check a patch is within the patch size limit.
+
+    Tools call this before parsing, so an oversized patch is rejected without
+    being scanned.
+
+    Args:
+        patch: Patch content to check
+
+    Returns:
+        None if the patch is within MAX_PATCH_SIZE characters, otherwise a dict
+        with 'error' and 'error_type' fields
+    """
+    if len(patch) > MAX_PATCH_SIZE:
+        return {
+            "error": f"Patch too large: {len(patch)} characters (max: {MAX_PATCH_SIZE})",
+            "error_type": "resource_limit",
+        }
+    return None
+
+
+@lru_cache(maxsize=16)
+def _free_disk_space(directory: str, tick: int) -> int:
+    """Free bytes on the filesystem holding a directory, cached for one second.
+
+    Batch operations on one directory validate many files back to back; caching
+    the result per one-second tick saves a statvfs() call for all but the first.
+
+    Args:
+        directory: Directory whose filesystem to query
+        tick: Current whole second of time.monotonic(); a new tick misses the cache
+
+    Returns:
+        Number of free bytes
+    """
+    return shutil.disk_usage(directory).free
+
+
+def validate_files_safety(
+    file_paths: Iterable[Path],
+    check_write: bool = False,
+    check_space: bool = False,
+    max_workers: int = 8,
+) -> Dict[Path, Optional[Dict[str, Any]]]:
+    """Run validate_file_safety on many files concurrently.
+
+    The checks are dominated by stat/open/read syscalls, which release the GIL,
+    so a small thread pool overlaps their latency across files.
+
+    Args:
+        file_paths: Paths of the files to validate
+        check_write: If True, verify each file is writable
+        check_space: If True, verify sufficient disk space for each file
+        max_workers: Maximum number of worker threads (default: 8)
+
+    Returns:
+        Dict mapping each path to None (all checks passed) or its error dict
+
+    Example:
+        >>> errors = validate_files_safety([Path("a.py"), Path("b.py")])
+        >>> failed = {p: e for p, e in errors.items() if e}
+    """
+    paths = list(file_paths)
+    if not paths:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+        results = executor.map(
+            lambda p: validate_file_safety(p, check_write=check_write, check_space=check_space),
+            paths,
+        )
+        return dict(zip(paths, results))
+
+
 def is_binary_file(file_path: Path, check_bytes: int = BINARY_CHECK_BYTES) -> bool:
     """Check if a file is binary.
 
@@ -134,39 +240,102 @@ def is_binary_file(file_path: Path, check_bytes: int = BINARY_CHECK_BYTES) -> bo
         >>> if is_binary_file(Path("image.png")):
         ...     print("Binary file detected")
     """
+    head = _read_head(file_path, check_bytes)
+    if head is None:
+        # If we can't read it, assume binary for safety
+        return True
+    return _is_binary_bytes(head)
+
+
+def _read_head(file_path: Path, check_bytes: int, follow_symlinks: bool = True) -> Optional[bytes]:
+    """Read up to check_bytes from the start of a file.
+
+    Args:
+        file_path: Path to the file to read
+        check_bytes: Maximum number of bytes to read
+        follow_symlinks: If False, refuse to open a symlink (O_NOFOLLOW where supported)
+
+    Returns:
+        The bytes read, or None if the file cannot be opened or read
+    """
+    try:
+        fd = _open_for_read(file_path, follow_symlinks)
+    except OSError:
+        return None
     try:
-        with open(file_path, "rb") as f:
-            chunk = f.read(check_bytes)
+        return os.read(fd, check_bytes)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
 
-            # Empty file is considered text
-            if not chunk:
-                return False
 
-            # Check for null bytes (strong indicator of binary)
-            if b"\x00" in chunk:
-                return True
+def read_file_bytes(file_path: Path) -> bytes:
+    """Read the whole content of a file without following a symlink.
 
-            # Try to decode as UTF-8 - if successful, it's likely text
-            try:
-                chunk.decode("utf-8")
-                return False  # Valid UTF-8 text
-            except UnicodeDecodeError:
-                pass  # Not valid UTF-8, continue checking
+    validate_file_safety() rejects symlinks, but the path could be swapped for one
+    between that check and the read; O_NOFOLLOW makes the open fail instead.
 
-            # Check for high ratio of non-text bytes
-            # Text characters: printable ASCII + common whitespace
-            text_chars = bytes(range(32, 127)) + b"\n\r\t\b"
-            non_text = sum(1 for byte in chunk if byte not in text_chars)
+    Args:
+        file_path: Path to the file to read
 
-            # If more than 30% non-text characters, likely binary
-            if (non_text / len(chunk)) > NON_TEXT_THRESHOLD:
-                return True
+    Returns:
+        The file content
 
-            return False
-    except Exception:
-        # If we can't read it, assume binary for safety
+    Raises:
+        OSError: If the file cannot be opened or read, including when it is a symlink
+    """
+    with os.fdopen(_open_for_read(file_path, follow_symlinks=False), "rb") as f:
+        return f.read()
+
+
+def _open_for_read(file_path: Path, follow_symlinks: bool) -> int:
+    """Open a file read-only and return its descriptor.
+
+    Args:
+        file_path: Path to the file to open
+        follow_symlinks: If False, refuse to open a symlink (O_NOFOLLOW where supported)
+
+    Raises:
+        OSError: If the file cannot be opened
+    """
+    flags = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+    if not follow_symlinks:
+        flags |= getattr(os, "O_NOFOLLOW", 0)
+    return os.open(file_path, flags)
+
+
+def _is_binary_bytes(chunk: bytes) -> bool:
+    """Apply the binary heuristics of is_binary_file to an in-memory chunk.
+
+    Args:
+        chunk: Leading bytes of a file
+
+    Returns:
+        True if the chunk appears to be binary, False otherwise
+    """
+    # Empty file is considered text
+    if not chunk:
+        return False
+
+    # Check for null bytes (strong indicator of binary)
+    if b"\x00" in chunk:
         return True
 
+    # Try to decode as UTF-8 - if successful, it's likely text
+    try:
+        chunk.decode("utf-8")
+        return False  # Valid UTF-8 text
+    except UnicodeDecodeError:
+        pass  # Not valid UTF-8, continue checking
+
+    # Check for high ratio of non-text bytes
+    # translate() deletes every text character in C, leaving only non-text bytes
+    non_text = len(chunk.translate(None, _TEXT_CHARS))
+
+    # If more than 30% non-text characters, likely binary
+    return (non_text / len(chunk)) > NON_TEXT_THRESHOLD
+
 
 def check_path_traversal(file_path: str, base_dir: str) -> Optional[Dict[str, Any]]:
     """Check if a path attempts to escape a base directory.
@@ -188,27 +357,44 @@ def check_path_traversal(file_path: str, base_dir: str) -> Optional[Dict[str, An
     """
     try:
         # Resolve to absolute paths to handle .. and symlinks
-        abs_file = Path(file_path).resolve()
-        abs_base = Path(base_dir).resolve()
+        abs_file = os.path.normcase(os.path.realpath(file_path))
+        abs_base = _canonical_base(os.path.abspath(base_dir))
 
         # Check if file path is under base directory
         try:
-            abs_file.relative_to(abs_base)
-            return None  # Path is safe
+            is_inside = os.path.commonpath([abs_file, abs_base]) == abs_base
         except ValueError:
-            return {
-                "error": f"Path attempts to escape base directory: {file_path}",
-                "error_type": "permission_denied",
-            }
+            # Paths on different drives (Windows) can never be nested
+            is_inside = False
+
+        if is_inside:
+            return None  # Path is safe
+        return {
+            "error": f"Path attempts to escape base directory: {file_path}",
+            "error_type": "permission_denied",
+        }
     except Exception as e:
         return {"error": f"Invalid path: {str(e)}", "error_type": "io_error"}
 
 
+@lru_cache(maxsize=128)
+def _canonical_base(base_dir: str) -> str:
+    """Resolve a base directory once; callers check many paths against the same base.
+
+    Args:
+        base_dir: Absolute path of the base directory
+
+    Returns:
+        Canonical (symlink-free, case-normalized) form of base_dir
+    """
+    return os.path.normcase(os.path.realpath(base_dir))
+
+
 def atomic_file_replace(source: Path, target: Path) -> None:
     """Atomically replace a file using rename.
 
-    Performs an atomic file replacement operation. On Unix systems, this is
-    truly atomic. On Windows, the target must be removed first (not atomic).
+    Performs an atomic file replacement operation using os.replace(), which
+    overwrites an existing target atomically on both Unix and Windows.
 
     Args:
         source: Path to the source file (must exist)
@@ -223,14 +409,66 @@ def atomic_file_replace(source: Path, target: Path) -> None:
         >>> # Write to temp_file first
         >>> atomic_file_replace(temp_file, target_file)
     """
-    if platform.system() == "Windows":
-        # Windows: need to remove target first (not atomic, but best we can do)
-        if target.exists():
-            target.unlink()
-        source.rename(target)
-    else:
-        # Unix: atomic rename
-        source.rename(target)
+    os.replace(source, target)
+
+
+def atomic_file_write(target: Path, data: bytes) -> None:
+    """Atomically replace a file with in-memory content.
+
+    Writes data to a securely created temporary file in the target's directory
+    and renames it over the target, so readers see either the old or the new
+    content, never a partial write. The temporary file is removed on failure.
+
+    Durability:
+        The temporary file and, on POSIX, the containing directory are fsynced so
+        the new content survives a crash. Set the environment variable
+        PATCH_MCP_FSYNC=0 to skip the fsyncs (e.g. for test runs on tmpfs).
+
+    Args:
+        target: Path to the file to write (will be created or replaced)
+        data: Complete new file content
+
+    Raises:
+        OSError: If writing or replacing fails
+
+    Example:
+        >>> atomic_file_write(Path("config.py"), b"DEBUG = True\n")
+    """
+    temp_fd, temp_path_str = tempfile.mkstemp(
+        dir=target.parent, prefix=".patch_tmp_", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(temp_fd, "wb") as f:
+            f.write(data)
+            if _fsync_enabled():
+                f.flush()
+                os.fsync(f.fileno())
+        atomic_file_replace(Path(temp_path_str), target)
+    except Exception:
+        # Clean up temp file on error
+        try:
+            os.unlink(temp_path_str)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename itself (directories cannot be opened on Windows).
+    # Best-effort: the file is already replaced, so a directory that cannot be
+    # opened or fsynced must not turn a completed write into a failure.
+    if _fsync_enabled() and os.name != "nt":
+        try:
+            dir_fd = os.open(target.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+def _fsync_enabled() -> bool:
+    """Check whether atomic writes should fsync (PATCH_MCP_FSYNC, default on)."""
+    return os.environ.get("PATCH_MCP_FSYNC", "1") != "0"
 
 
 def sanitize_error_message(message: str, max_content_length: int = 50) -> str:
@@ -256,10 +494,8 @@ def sanitize_error_message(message: str, max_content_length: int = 50) -> str:
         >>> sanitize_error_message(msg)
         "Context mismatch: expected '[CONTENT]' but found '[CONTENT]'"
     """
-    # Pattern 1: Replace long quoted strings with [CONTENT]
-    import re
-    from re import Match
 
+    # Pattern 1: Replace long quoted strings with [CONTENT]
     # Find quoted strings longer than max_content_length
     def replace_long_quotes(match: Match[str]) -> str:
         content = match.group(1)
@@ -267,13 +503,13 @@ def sanitize_error_message(message: str, max_content_length: int = 50) -> str:
             return "'[CONTENT]'"
         return match.group(0)
 
-    sanitized = re.sub(r"'([^']*)'", replace_long_quotes, message)
+    sanitized = _QUOTED_PATTERN.sub(replace_long_quotes, message)
 
     # Pattern 2: Remove absolute paths but keep filename
     # Replace /full/path/to/file.txt with file.txt
-    sanitized = re.sub(r"/(?:[^/\s]+/)+([^/\s]+)", r"\1", sanitized)
+    sanitized = _POSIX_PATH_PATTERN.sub(r"\1", sanitized)
     # Also handle Windows paths
-    sanitized = re.sub(r"[A-Za-z]:\\(?:[^\\:\s]+\\)+([^\\:\s]+)", r"\1", sanitized)
+    sanitized = _WINDOWS_PATH_PATTERN.sub(r"\1", sanitized)
 
     return sanitized
 
@@ -307,42 +543,28 @@ def detect_sensitive_content(content: str) -> Dict[str, Any]:
         >>> if result["has_sensitive"]:
         ...     print(f"WARNING: {result['recommendation']}")
     """
-    import re
-
     findings = []
 
     # Pattern 1: Private keys
-    if re.search(r"-----BEGIN (RSA|DSA|EC|OPENSSH|PGP) PRIVATE KEY-----", content, re.IGNORECASE):
+    if _PRIVATE_KEY_PATTERN.search(content):
         findings.append("Private cryptographic key detected")
 
     # Pattern 2: API keys and tokens (common formats)
-    api_key_patterns = [
-        (r"api[_-]?key\s*[:=]\s*['\"]?[a-zA-Z0-9_\-]{20,}['\"]?", "API key"),
-        (r"token\s*[:=]\s*['\"]?[a-zA-Z0-9_\-]{20,}['\"]?", "Token"),
-        (r"secret\s*[:=]\s*['\"]?[a-zA-Z0-9_\-]{20,}['\"]?", "Secret"),
-        (r"password\s*[:=]\s*['\"]?[^\s'\"]{8,}['\"]?", "Password"),
-    ]
-
-    for pattern, name in api_key_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
+    for pattern, name in _API_KEY_PATTERNS:
+        if pattern.search(content):
             findings.append(f"{name} pattern detected")
 
     # Pattern 3: AWS credentials
-    if re.search(r"AKIA[0-9A-Z]{16}", content):
+    if _AWS_KEY_PATTERN.search(content):
         findings.append("AWS access key ID detected")
 
     # Pattern 4: JWT tokens
-    if re.search(r"eyJ[a-zA-Z0-9_-]*\.eyJ[a-zA-Z0-9_-]*\.[a-zA-Z0-9_-]*", content):
+    if _JWT_PATTERN.search(content):
         findings.append("JWT token detected")
 
     # Pattern 5: Database connection strings
-    db_patterns = [
-        r"(postgres|mysql|mongodb)://[^\s]+:[^\s]+@",
-        r"Server=.*;Database=.*;User.*=.*;Password=.*",
-    ]
-
-    for pattern in db_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
+    for pattern in _DB_PATTERNS:
+        if pattern.search(content):
             findings.append("Database connection string detected")
             break
 
@@ -0,0 +1,48 @@
+"""Shared pytest configuration for the patch_mcp test suite."""
+
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from pyfakefs.fake_filesystem_unittest import Patcher
+
+from patch_mcp.server import list_tools
+from patch_mcp.utils import _free_disk_space
+
+
+@pytest.fixture(autouse=True)
+def _disable_fsync(monkeypatch):
+    """Skip fsync in atomic writes; tests run on throwaway temp directories."""
+    monkeypatch.setenv("PATCH_MCP_FSYNC", "0")
+
+
+@pytest.fixture(autouse=True)
+def _clear_disk_space_cache():
+    """Keep the cached free-space lookups from leaking mocked values between tests."""
+    _free_disk_space.cache_clear()
+    yield
+    _free_disk_space.cache_clear()
+
+
+@pytest.fixture
+def fake_fs():
+    """In-memory filesystem for tests of pure logic; yields an empty directory in it.
+
+    Tests that depend on real VFS semantics (permissions, symlinks, atomic
+    replacement) keep using tmp_path.
+    """
+    with Patcher() as patcher:
+        patcher.fs.create_dir("/t")
+        yield Path("/t")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def tools():
+    """Registered MCP tools, listed once per test session."""
+    return await list_tools()
+
+
+@pytest.fixture(scope="session")
+def tool_schemas(tools):
+    """Input schema of each registered MCP tool, keyed by tool name."""
+    return {tool.name: tool.inputSchema for tool in tools}
@@ -11,10 +11,10 @@ Usage:
 """
 
 import asyncio
-import json
 import tempfile
 from pathlib import Path
 
+import orjson
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
@@ -57,7 +57,7 @@ async def test_server() -> None:
  line3
 """
             result = await session.call_tool("inspect_patch", arguments={"patch": test_patch})
-            data = json.loads(result.content[0].text)
+            data = orjson.loads(result.content[0].text)
             print(f"Success: {data['success']}")
             print(f"Files affected: {data['summary']['total_files']}")
             print(f"Lines added: {data['summary']['total_lines_added']}")
@@ -82,7 +82,7 @@ async def test_server() -> None:
                         "modified_file": str(modified),
                     },
                 )
-                data = json.loads(result.content[0].text)
+                data = orjson.loads(result.content[0].text)
                 print(f"Success: {data['success']}")
                 print(f"Lines added: {data['changes']['lines_added']}")
                 print(f"Lines removed: {data['changes']['lines_removed']}")
@@ -98,7 +98,7 @@ async def test_server() -> None:
                         "patch": generated_patch,
                     },
                 )
-                data = json.loads(result.content[0].text)
+                data = orjson.loads(result.content[0].text)
                 print(f"Success: {data['success']}")
                 print(f"Can apply: {data['can_apply']}")
                 print(f"Preview lines to add: {data['preview']['lines_to_add']}")
@@ -113,7 +113,7 @@ async def test_server() -> None:
                     "backup_file",
                     arguments={"file_path": str(test_file)},
                 )
-                data = json.loads(result.content[0].text)
+                data = orjson.loads(result.content[0].text)
                 print(f"Success: {data['success']}")
                 print(f"Backup file: {Path(data['backup_file']).name}")
                 print(f"Backup size: {data['backup_size']} bytes")
@@ -130,7 +130,7 @@ async def test_server() -> None:
                         "dry_run": True,
                     },
                 )
-                data = json.loads(result.content[0].text)
+                data = orjson.loads(result.content[0].text)
                 print(f"Success: {data['success']}")
                 print(f"Applied (dry run): {data['applied']}")
                 print(f"Message: {data['message']}")
@@ -145,7 +145,7 @@ async def test_server() -> None:
                         "patch": generated_patch,
                     },
                 )
-                data = json.loads(result.content[0].text)
+                data = orjson.loads(result.content[0].text)
                 print(f"Success: {data['success']}")
                 print(f"Applied: {data['applied']}")
                 print(f"Lines added: {data['changes']['lines_added']}")
@@ -160,7 +160,7 @@ async def test_server() -> None:
                         "patch": generated_patch,
                     },
                 )
-                data = json.loads(result.content[0].text)
+                data = orjson.loads(result.content[0].text)
                 print(f"Success: {data['success']}")
                 print(f"Reverted: {data['reverted']}")
                 print(f"Lines added (revert): {data['changes']['lines_added']}")
@@ -178,7 +178,7 @@ async def test_server() -> None:
                         "force": True,
                     },
                 )
-                data = json.loads(result.content[0].text)
+                data = orjson.loads(result.content[0].text)
                 print(f"Success: {data['success']}")
                 print(f"Restored to: {Path(data['restored_to']).name}")
                 print(f"Restored size: {data['restored_size']} bytes")
@@ -224,7 +224,7 @@ async def test_error_handling() -> None:
                 "inspect_patch",
                 arguments={"patch": "not a valid patch"},
             )
-            data = json.loads(result.content[0].text)
+            data = orjson.loads(result.content[0].text)
             print(f"Success: {data['success']}")
             print(f"Error type: {data.get('error_type', 'N/A')}")
 
@@ -238,7 +238,7 @@ async def test_error_handling() -> None:
                     "patch": "--- file\n+++ file\n",
                 },
             )
-            data = json.loads(result.content[0].text)
+            data = orjson.loads(result.content[0].text)
             print(f"Success: {data['success']}")
             print(f"Error type: {data.get('error_type', 'N/A')}")
 
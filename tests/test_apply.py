@@ -9,7 +9,12 @@ Tests the patch application functionality including:
 - Security checks
 """
 
+import os
+import stat
+from unittest import mock
+
 from patch_mcp.tools.apply import apply_patch
+from patch_mcp.tools.validate import _parse_patch, validate_patch
 
 
 class TestApplyPatch:
@@ -192,9 +197,35 @@ class TestApplyPatch:
         assert result["error_type"] == "symlink_error"
         assert result["applied"] is False
 
-    def test_reject_binary(self, tmp_path):
+    def test_symlink_swapped_in_after_safety_check_is_not_followed(self, tmp_path):
+        """A file replaced by a symlink after the safety check is not read through."""
+        real_file = tmp_path / "real.txt"
+        real_file.write_text("content\n")
+        file = tmp_path / "file.txt"
+        file.write_text("content\n")
+
+        patch = """--- file.txt
++++ file.txt
+@@ -1,1 +1,1 @@
+-content
++modified
+"""
+
+        def swap_after_check(path, **kwargs):
+            file.unlink()
+            file.symlink_to(real_file)
+            return None
+
+        with mock.patch("patch_mcp.tools.apply.validate_file_safety", swap_after_check):
+            result = apply_patch(str(file), patch)
+
+        assert result["success"] is False
+        assert result["error_type"] == "io_error"
+        assert real_file.read_text() == "content\n"
+
+    def test_reject_binary(self, fake_fs):
         """Binary files should be rejected."""
-        binary = tmp_path / "binary.dat"
+        binary = fake_fs / "binary.dat"
         binary.write_bytes(b"\x00\x01\x02" * 100)
 
         patch = """--- binary.dat
@@ -244,6 +275,32 @@ class TestApplyPatch:
         assert "line1 modified" in content
         assert "line9 modified" in content
 
+    def test_apply_hunks_out_of_order(self, tmp_path):
+        """Hunks listed out of file order are applied at their own positions."""
+        file = tmp_path / "file.py"
+        file.write_text("".join(f"line{i}\n" for i in range(1, 11)))
+
+        patch = """--- file.py
++++ file.py
+@@ -9,2 +9,3 @@
+ line9
++line9b
+ line10
+@@ -2,2 +2,1 @@
+-line2
+ line3
+@@ -5,1 +4,1 @@
+-line5
++line5 modified
+"""
+
+        result = apply_patch(str(file), patch)
+
+        assert result["success"] is True
+        assert file.read_text() == (
+            "line1\nline3\nline4\nline5 modified\nline6\nline7\nline8\n" "line9\nline9b\nline10\n"
+        )
+
     def test_apply_addition_only(self, tmp_path):
         """Apply patch with only additions."""
         file = tmp_path / "file.py"
@@ -349,6 +406,137 @@ class TestApplyPatch:
         content = file.read_text()
         assert "modified\n" in content
 
+    def test_apply_preserves_untouched_crlf_lines(self, tmp_path):
+        """CRLF files keep CRLF on untouched and spliced lines alike."""
+        file = tmp_path / "file.txt"
+        file.write_bytes(b"line1\r\nline2\r\nline3\r\nline4\r\nline5\r\n")
+
+        patch = """--- file.txt
++++ file.txt
+@@ -2,3 +2,3 @@
+ line2
+-line3
++modified
+ line4
+"""
+
+        result = apply_patch(str(file), patch)
+
+        assert result["success"] is True
+        content = file.read_bytes()
+        assert content == b"line1\r\nline2\r\nmodified\r\nline4\r\nline5\r\n"
+
+    def test_apply_identical_content_keeps_mtime(self, tmp_path):
+        """A patch that leaves the bytes unchanged does not rewrite the file."""
+        file = tmp_path / "file.txt"
+        file.write_text("line1\nline2\n")
+        os.utime(file, (1_000_000_000, 1_000_000_000))
+
+        patch = """--- file.txt
++++ file.txt
+@@ -1,2 +1,2 @@
+-line1
++line1
+ line2
+"""
+
+        result = apply_patch(str(file), patch)
+
+        assert result["success"] is True
+        assert file.read_text() == "line1\nline2\n"
+        assert file.stat().st_mtime == 1_000_000_000
+
+    def test_validate_then_apply_parses_once(self, tmp_path):
+        """apply_patch reuses the parse done by a preceding validate_patch."""
+        file = tmp_path / "file.txt"
+        file.write_text("line1\nline2\n")
+
+        patch = """--- file.txt
++++ file.txt
+@@ -1,2 +1,2 @@
+ line1
+-line2
++line2 cached
+"""
+
+        _parse_patch.cache_clear()
+        assert validate_patch(str(file), patch)["success"] is True
+        assert apply_patch(str(file), patch)["success"] is True
+
+        # One parse; apply_patch's validation and edit both hit the cache
+        info = _parse_patch.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
+        assert file.read_text() == "line1\nline2 cached\n"
+
+    def test_apply_rejects_hunk_count_mismatch(self, tmp_path):
+        """A hunk whose header covers more lines than its body leaves the file alone."""
+        file = tmp_path / "file.txt"
+        file.write_text("l1\nl2\nl3\nl4\n")
+
+        patch = """--- file.txt
++++ file.txt
+@@ -1,3 +1,3 @@
+-l1
++X
+ l2
+"""
+
+        result = apply_patch(str(file), patch)
+
+        assert result["success"] is False
+        assert result["error_type"] == "invalid_patch"
+        assert file.read_text() == "l1\nl2\nl3\nl4\n"
+
+    def test_apply_reads_file_once(self, tmp_path):
+        """Validation and the edit share a single full read of the file."""
+        file = tmp_path / "file.txt"
+        file.write_text("line1\nline2\n")
+
+        patch = """--- file.txt
++++ file.txt
+@@ -1,2 +1,2 @@
+ line1
+-line2
++line2 changed
+"""
+
+        with mock.patch("os.fdopen", wraps=os.fdopen) as spy:
+            result = apply_patch(str(file), patch)
+
+        assert result["success"] is True
+        reads = [c for c in spy.call_args_list if c.args[1] == "rb"]
+        assert len(reads) == 1
+        assert file.read_text() == "line1\nline2 changed\n"
+
+    def test_apply_succeeds_when_directory_fsync_fails(self, tmp_path, monkeypatch):
+        """A failed directory fsync after the rename does not fail the apply."""
+        file = tmp_path / "file.txt"
+        file.write_text("line1\nline2\n")
+
+        patch = """--- file.txt
++++ file.txt
+@@ -1,2 +1,2 @@
+ line1
+-line2
++line2 changed
+"""
+
+        real_fsync = os.fsync
+
+        def fsync_fails_on_directories(fd):
+            if stat.S_ISDIR(os.fstat(fd).st_mode):
+                raise OSError(22, "Invalid argument")
+            real_fsync(fd)
+
+        monkeypatch.setenv("PATCH_MCP_FSYNC", "1")
+        monkeypatch.setattr(os, "fsync", fsync_fails_on_directories)
+        result = apply_patch(str(file), patch)
+
+        assert result["success"] is True
+        assert result["applied"] is True
+        assert file.read_text() == "line1\nline2 changed\n"
+
     def test_apply_creates_backup_atomically(self, tmp_path):
         """Apply should use atomic file replacement."""
         file = tmp_path / "file.txt"
@@ -14,6 +14,9 @@ from pathlib import Path
 
 from patch_mcp.tools.backup import backup_file, parse_backup_filename, restore_backup
 
+# 5MB of pre-encoded text for the large-file tests
+FIVE_MB_TEXT = b"x" * (5 * 1024 * 1024)
+
 
 class TestBackupFile:
     """Test backup_file function."""
@@ -172,8 +175,7 @@ class TestBackupFile:
         """Backup works with large files (< 10MB limit)."""
         original = tmp_path / "large.txt"
         # Create 5MB file
-        content = "x" * (5 * 1024 * 1024)
-        original.write_text(content)
+        original.write_bytes(FIVE_MB_TEXT)
 
         result = backup_file(str(original))
 
@@ -651,8 +653,7 @@ class TestBackupErrorPaths:
         """Test insufficient disk space for 110% safety margin."""
         original = tmp_path / "large.txt"
         # Create 1MB file
-        content = "x" * (1024 * 1024)
-        original.write_text(content)
+        original.write_bytes(memoryview(FIVE_MB_TEXT)[: 1024 * 1024])
 
         # Mock disk_usage to return space > 100MB but < 110% of file size
         import shutil
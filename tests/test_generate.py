@@ -10,6 +10,8 @@ Tests the patch generation functionality including:
 - File not found errors
 """
 
+from unittest import mock
+
 from patch_mcp.tools.generate import generate_patch
 
 
@@ -68,14 +70,29 @@ class TestGeneratePatch:
         assert result["changes"]["hunks"] == 0
         assert result["message"] == "Files are identical - no patch generated"
 
-    def test_generate_reject_binary(self, tmp_path):
+    def test_generate_identical_files_skips_difflib(self, tmp_path):
+        """Identical files return the empty result without running a diff."""
+        file1 = tmp_path / "file1.txt"
+        file2 = tmp_path / "file2.txt"
+        file1.write_text("same\n")
+        file2.write_text("same\n")
+
+        with mock.patch("patch_mcp.tools.generate.difflib.unified_diff") as unified_diff:
+            result = generate_patch(str(file1), str(file2))
+
+        unified_diff.assert_not_called()
+        assert result["success"] is True
+        assert result["patch"] == ""
+        assert result["changes"]["hunks"] == 0
+
+    def test_generate_reject_binary(self, fake_fs):
         """Binary files should be rejected."""
         # Create binary file (contains null bytes)
-        binary_file = tmp_path / "binary.dat"
+        binary_file = fake_fs / "binary.dat"
         binary_file.write_bytes(b"\x00\x01\x02" * 100)
 
         # Create text file
-        text_file = tmp_path / "text.txt"
+        text_file = fake_fs / "text.txt"
         text_file.write_text("some text\n")
 
         # Test binary as original
@@ -217,14 +234,14 @@ class TestGeneratePatch:
         assert result["changes"]["lines_removed"] == 2
         assert result["changes"]["hunks"] == 1
 
-    def test_generate_encoding_error(self, tmp_path):
+    def test_generate_encoding_error(self, fake_fs):
         """Non-UTF-8 files should be rejected (binary or encoding error)."""
         # Create file with invalid UTF-8 (high bytes trigger binary detection)
-        bad_file = tmp_path / "bad.txt"
+        bad_file = fake_fs / "bad.txt"
         bad_file.write_bytes(b"\x80\x81\x82\x83")  # Invalid UTF-8
 
         # Create good file
-        good_file = tmp_path / "good.txt"
+        good_file = fake_fs / "good.txt"
         good_file.write_text("content\n")
 
         # Test bad original - binary detection happens first
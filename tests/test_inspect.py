@@ -9,6 +9,7 @@ Tests the patch inspection functionality including:
 """
 
 from patch_mcp.tools.inspect import inspect_patch
+from patch_mcp.utils import MAX_PATCH_SIZE
 
 
 class TestInspectPatch:
@@ -335,3 +336,14 @@ Without proper formatting
         assert result["files"][0]["target"] == "/dev/null"
         assert result["files"][0]["lines_added"] == 0
         assert result["files"][0]["lines_removed"] == 3
+
+    def test_inspect_oversized_patch(self):
+        """A patch over MAX_PATCH_SIZE is a resource limit, not an invalid patch."""
+        patch = "--- f\n+++ f\n" + "x" * MAX_PATCH_SIZE
+
+        result = inspect_patch(patch)
+
+        assert result["success"] is False
+        assert result["error_type"] == "resource_limit"
+        assert "valid" not in result
+        assert result["message"] == "Patch exceeds size limit"
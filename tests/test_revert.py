@@ -14,10 +14,10 @@ from patch_mcp.tools.revert import revert_patch
 class TestRevertPatch:
     """Test suite for revert_patch tool."""
 
-    def test_revert_success(self, tmp_path):
+    def test_revert_success(self, fake_fs):
         """Apply then revert should restore original content."""
         # Create file
-        file = tmp_path / "config.py"
+        file = fake_fs / "config.py"
         original_content = "DEBUG = False\nLOG_LEVEL = 'INFO'\nPORT = 8000\n"
         file.write_text(original_content)
 
@@ -36,8 +36,9 @@ class TestRevertPatch:
         assert apply_result["success"] is True
 
         # Verify file was modified
-        assert file.read_text() != original_content
-        assert "LOG_LEVEL = 'DEBUG'" in file.read_text()
+        patched_content = file.read_text()
+        assert patched_content != original_content
+        assert "LOG_LEVEL = 'DEBUG'" in patched_content
 
         # Revert patch
         revert_result = revert_patch(str(file), patch)
@@ -56,10 +57,10 @@ class TestRevertPatch:
         # CRITICAL: File should be back to original
         assert file.read_text() == original_content
 
-    def test_revert_after_modification(self, tmp_path):
+    def test_revert_after_modification(self, fake_fs):
         """Revert should fail if file was modified after patch."""
         # Create file and apply patch
-        file = tmp_path / "config.py"
+        file = fake_fs / "config.py"
         file.write_text("DEBUG = False\nLOG_LEVEL = 'INFO'\nPORT = 8000\n")
 
         patch = """--- config.py
@@ -86,9 +87,9 @@ class TestRevertPatch:
         assert revert_result["error_type"] == "context_mismatch"
         assert "modified" in revert_result["error"].lower()
 
-    def test_revert_file_not_found(self, tmp_path):
+    def test_revert_file_not_found(self, fake_fs):
         """Revert on missing file should fail."""
-        missing = tmp_path / "missing.txt"
+        missing = fake_fs / "missing.txt"
         patch = """--- missing.txt
 +++ missing.txt
 @@ -1,1 +1,1 @@
@@ -102,10 +103,10 @@ class TestRevertPatch:
         assert result["reverted"] is False
         assert result["error_type"] == "file_not_found"
 
-    def test_revert_unchanged_if_already_reverted(self, tmp_path):
+    def test_revert_unchanged_if_already_reverted(self, fake_fs):
         """Reverting twice should fail (file already in original state)."""
         # Create file
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         original = "line1\nline2\nline3\n"
         file.write_text(original)
 
@@ -132,9 +133,9 @@ class TestRevertPatch:
         assert result["success"] is False
         assert result["reverted"] is False
 
-    def test_revert_multiple_hunks(self, tmp_path):
+    def test_revert_multiple_hunks(self, fake_fs):
         """Revert patch with multiple hunks."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         original = "line1\nline2\nline3\nline4\nline5\n" "line6\nline7\nline8\nline9\nline10\n"
         file.write_text(original)
 
@@ -165,9 +166,9 @@ class TestRevertPatch:
         # File should be back to original
         assert file.read_text() == original
 
-    def test_revert_addition_only(self, tmp_path):
+    def test_revert_addition_only(self, fake_fs):
         """Revert patch that only added lines."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         original = "line1\nline2\n"
         file.write_text(original)
 
@@ -195,9 +196,9 @@ class TestRevertPatch:
         # File back to original
         assert file.read_text() == original
 
-    def test_revert_removal_only(self, tmp_path):
+    def test_revert_removal_only(self, fake_fs):
         """Revert patch that only removed lines."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         original = "line1\nremove_me\nline2\n"
         file.write_text(original)
 
@@ -225,9 +226,9 @@ class TestRevertPatch:
         # File back to original
         assert file.read_text() == original
 
-    def test_revert_empty_patch(self, tmp_path):
+    def test_revert_empty_patch(self, fake_fs):
         """Reverting an empty patch should succeed."""
-        file = tmp_path / "file.txt"
+        file = fake_fs / "file.txt"
         content = "content\n"
         file.write_text(content)
 
@@ -240,9 +241,19 @@ class TestRevertPatch:
         # File unchanged
         assert file.read_text() == content
 
-    def test_revert_complex_patch(self, tmp_path):
+    def test_revert_empty_patch_skips_file_checks(self, fake_fs):
+        """Empty patch is a no-op and never touches the filesystem."""
+        missing = fake_fs / "missing.txt"
+
+        result = revert_patch(str(missing), "  \n")
+
+        assert result["success"] is True
+        assert result["changes"]["hunks_reverted"] == 0
+        assert not missing.exists()
+
+    def test_revert_complex_patch(self, fake_fs):
         """Revert complex patch with mixed operations."""
-        file = tmp_path / "complex.py"
+        file = fake_fs / "complex.py"
         original = "def foo():\n    old1\n    old2\n    keep\n"
         file.write_text(original)
 
@@ -272,12 +283,12 @@ class TestRevertPatch:
         # Back to original
         assert file.read_text() == original
 
-    def test_revert_preserves_error_type(self, tmp_path):
+    def test_revert_preserves_error_type(self, fake_fs):
         """Error types from apply should be preserved."""
         # Create symlink
-        real_file = tmp_path / "real.txt"
+        real_file = fake_fs / "real.txt"
         real_file.write_text("content\n")
-        symlink = tmp_path / "link.txt"
+        symlink = fake_fs / "link.txt"
         symlink.symlink_to(real_file)
 
         patch = """--- link.txt
@@ -293,9 +304,9 @@ class TestRevertPatch:
         assert result["success"] is False
         assert result["error_type"] == "symlink_error"
 
-    def test_revert_with_whitespace_changes(self, tmp_path):
+    def test_revert_with_whitespace_changes(self, fake_fs):
         """Revert whitespace-only changes."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         original = "line1\nline2\nline3\n"
         file.write_text(original)
 
@@ -320,9 +331,9 @@ class TestRevertPatch:
         # Should restore exact original (including whitespace)
         assert file.read_text() == original
 
-    def test_revert_sequential_patches(self, tmp_path):
+    def test_revert_sequential_patches(self, fake_fs):
         """Test reverting patches in reverse order."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         v0 = "version0\n"
         file.write_text(v0)
 
@@ -353,3 +364,25 @@ class TestRevertPatch:
 
         revert_patch(str(file), patch1)
         assert file.read_text() == v0
+
+    def test_revert_omitted_hunk_counts(self, fake_fs):
+        """Hunk headers without counts are reversed correctly."""
+        file = fake_fs / "file.py"
+        original = "line1\nline2\n"
+        file.write_text(original)
+
+        patch = """--- file.py
++++ file.py
+@@ -1 +1,2 @@
+ line1
++inserted
+"""
+
+        apply_patch(str(file), patch)
+        assert file.read_text() == "line1\ninserted\nline2\n"
+
+        result = revert_patch(str(file), patch)
+
+        assert result["success"] is True
+        assert result["changes"]["lines_removed"] == 1
+        assert file.read_text() == original
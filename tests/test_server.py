@@ -6,9 +6,55 @@ without requiring actual MCP protocol communication.
 
 import json
 
+import orjson
 import pytest
+import pytest_asyncio
+from mcp.server import Server as MCPServer
 
-from patch_mcp.server import call_tool, list_tools, server
+from patch_mcp.server import BATCHABLE_TOOLS, call_tool, server
+from patch_mcp.tools.validate import _parse_patch
+
+# Patches shared by the routing and integration tests
+LINE1_MODIFIED_PATCH = """--- test.txt
++++ test.txt
+@@ -1,2 +1,2 @@
+-line1
++line1_modified
+ line2
+"""
+
+OLD_TO_NEW_PATCH = """--- file.txt
++++ file.txt
+@@ -1,1 +1,1 @@
+-old
++new
+"""
+
+LINE2_MODIFIED_PATCH = """--- flow_test.txt
++++ flow_test.txt
+@@ -1,2 +1,2 @@
+ line1
+-line2
++line2_modified
+"""
+
+
+def unwrap_tool_result(result):
+    """Check a call_tool response is a single TextContent and return its parsed JSON."""
+    assert isinstance(result, list)
+    assert len(result) == 1
+    assert result[0].type == "text"
+    return orjson.loads(result[0].text)
+
+
+@pytest.fixture(scope="class")
+def class_tmp(tmp_path_factory):
+    """Temporary directory shared by the tests of one class.
+
+    Only for tests that don't depend on the directory's other contents; each
+    test names its files after itself (request.node.name) to stay independent.
+    """
+    return tmp_path_factory.mktemp("server_tests")
 
 
 class TestServerInitialization:
@@ -20,24 +66,18 @@ class TestServerInitialization:
 
     def test_server_instance(self):
         """Server is a valid MCP Server instance."""
-        from mcp.server import Server
-
-        assert isinstance(server, Server)
+        assert isinstance(server, MCPServer)
 
 
 class TestToolRegistration:
     """Test tool registration and schemas."""
 
-    @pytest.mark.asyncio
-    async def test_list_tools_count(self):
-        """All 7 tools are registered."""
-        tools = await list_tools()
-        assert len(tools) == 7
+    def test_list_tools_count(self, tools):
+        """All 8 tools are registered."""
+        assert len(tools) == 8
 
-    @pytest.mark.asyncio
-    async def test_tool_names(self):
+    def test_tool_names(self, tools):
         """All expected tool names are present."""
-        tools = await list_tools()
         tool_names = {tool.name for tool in tools}
 
         expected_names = {
@@ -48,226 +88,222 @@ class TestToolRegistration:
             "inspect_patch",
             "backup_file",
             "restore_backup",
+            "batch_tools",
         }
 
         assert tool_names == expected_names
 
-    @pytest.mark.asyncio
-    async def test_all_tools_have_descriptions(self):
+    def test_all_tools_have_descriptions(self, tools):
         """All tools have descriptions."""
-        tools = await list_tools()
-
         for tool in tools:
             assert tool.description
             assert len(tool.description) > 0
 
-    @pytest.mark.asyncio
-    async def test_all_tools_have_schemas(self):
+    def test_all_tools_have_schemas(self, tools):
         """All tools have proper input schemas."""
-        tools = await list_tools()
-
         for tool in tools:
-            tool_dict = tool.model_dump()
-            assert "inputSchema" in tool_dict
-            schema = tool_dict["inputSchema"]
-            assert "type" in schema
+            schema = tool.inputSchema
             assert schema["type"] == "object"
             assert "properties" in schema
             assert "required" in schema
 
 
+# (tool name, expected properties, required properties, property defaults)
+SCHEMA_EXPECTATIONS = [
+    ("apply_patch", {"file_path", "patch", "dry_run"}, {"file_path", "patch"}, {"dry_run": False}),
+    ("validate_patch", {"file_path", "patch"}, {"file_path", "patch"}, {}),
+    ("revert_patch", {"file_path", "patch"}, {"file_path", "patch"}, {}),
+    (
+        "generate_patch",
+        {"original_file", "modified_file", "context_lines"},
+        {"original_file", "modified_file"},
+        {"context_lines": 3},
+    ),
+    ("inspect_patch", {"patch"}, {"patch"}, {}),
+    ("backup_file", {"file_path"}, {"file_path"}, {}),
+    (
+        "restore_backup",
+        {"backup_file", "target_file", "force"},
+        {"backup_file"},
+        {"force": False},
+    ),
+    ("batch_tools", {"operations"}, {"operations"}, {}),
+]
+
+
 class TestToolSchemas:
     """Test individual tool schemas."""
 
-    @pytest.mark.asyncio
-    async def test_apply_patch_schema(self):
-        """apply_patch has correct schema."""
-        tools = await list_tools()
-        apply_tool = next(t for t in tools if t.name == "apply_patch")
-
-        schema = apply_tool.inputSchema
-        assert "file_path" in schema["properties"]
-        assert "patch" in schema["properties"]
-        assert "dry_run" in schema["properties"]
-        assert set(schema["required"]) == {"file_path", "patch"}
-
-        # Check dry_run has default
-        assert schema["properties"]["dry_run"]["default"] is False
-
-    @pytest.mark.asyncio
-    async def test_validate_patch_schema(self):
-        """validate_patch has correct schema."""
-        tools = await list_tools()
-        validate_tool = next(t for t in tools if t.name == "validate_patch")
-
-        schema = validate_tool.inputSchema
-        assert "file_path" in schema["properties"]
-        assert "patch" in schema["properties"]
-        assert set(schema["required"]) == {"file_path", "patch"}
-
-    @pytest.mark.asyncio
-    async def test_revert_patch_schema(self):
-        """revert_patch has correct schema."""
-        tools = await list_tools()
-        revert_tool = next(t for t in tools if t.name == "revert_patch")
-
-        schema = revert_tool.inputSchema
-        assert "file_path" in schema["properties"]
-        assert "patch" in schema["properties"]
-        assert set(schema["required"]) == {"file_path", "patch"}
-
-    @pytest.mark.asyncio
-    async def test_generate_patch_schema(self):
-        """generate_patch has correct schema."""
-        tools = await list_tools()
-        generate_tool = next(t for t in tools if t.name == "generate_patch")
-
-        schema = generate_tool.inputSchema
-        assert "original_file" in schema["properties"]
-        assert "modified_file" in schema["properties"]
-        assert "context_lines" in schema["properties"]
-        assert set(schema["required"]) == {"original_file", "modified_file"}
-
-        # Check context_lines has default
-        assert schema["properties"]["context_lines"]["default"] == 3
-
-    @pytest.mark.asyncio
-    async def test_inspect_patch_schema(self):
-        """inspect_patch has correct schema."""
-        tools = await list_tools()
-        inspect_tool = next(t for t in tools if t.name == "inspect_patch")
-
-        schema = inspect_tool.inputSchema
-        assert "patch" in schema["properties"]
-        assert schema["required"] == ["patch"]
-
-    @pytest.mark.asyncio
-    async def test_backup_file_schema(self):
-        """backup_file has correct schema."""
-        tools = await list_tools()
-        backup_tool = next(t for t in tools if t.name == "backup_file")
-
-        schema = backup_tool.inputSchema
-        assert "file_path" in schema["properties"]
-        assert schema["required"] == ["file_path"]
-
-    @pytest.mark.asyncio
-    async def test_restore_backup_schema(self):
-        """restore_backup has correct schema."""
-        tools = await list_tools()
-        restore_tool = next(t for t in tools if t.name == "restore_backup")
-
-        schema = restore_tool.inputSchema
-        assert "backup_file" in schema["properties"]
-        assert "target_file" in schema["properties"]
-        assert "force" in schema["properties"]
-        assert schema["required"] == ["backup_file"]
-
-        # Check force has default
-        assert schema["properties"]["force"]["default"] is False
+    @pytest.mark.parametrize("name,props,required,defaults", SCHEMA_EXPECTATIONS)
+    def test_tool_schema(self, tool_schemas, name, props, required, defaults):
+        """Each tool declares its properties, required fields and defaults."""
+        schema = tool_schemas[name]
+
+        assert props <= set(schema["properties"])
+        assert set(schema["required"]) == required
+        for prop, default in defaults.items():
+            actual = schema["properties"][prop]["default"]
+            assert actual == default and type(actual) is type(default)
 
 
 class TestToolRouting:
     """Test tool routing and execution."""
 
-    @pytest.mark.asyncio
     async def test_call_unknown_tool(self):
         """Unknown tool raises ValueError."""
         with pytest.raises(ValueError, match="Unknown tool"):
             await call_tool("unknown_tool", {})
 
-    @pytest.mark.asyncio
-    async def test_call_tool_returns_text_content(self, tmp_path):
+    async def test_batch_tools_unknown_tool(self, tmp_path):
+        """An unknown tool anywhere in a batch is rejected before any operation runs."""
+        test_file = tmp_path / "untouched.txt"
+        test_file.write_text("content\n")
+
+        with pytest.raises(ValueError, match="Unknown tool in batch_tools"):
+            await call_tool(
+                "batch_tools",
+                {
+                    "operations": [
+                        {"tool": "backup_file", "arguments": {"file_path": str(test_file)}},
+                        {"tool": "batch_tools", "arguments": {"operations": []}},
+                    ]
+                },
+            )
+
+        # The backup_file operation never ran
+        assert list(tmp_path.iterdir()) == [test_file]
+
+    async def test_batch_tools_missing_argument(self, fake_fs):
+        """A later operation missing a required argument is rejected before any runs."""
+        test_file = fake_fs / "untouched.txt"
+        test_file.write_text("line1\nline2\n")
+
+        with pytest.raises(ValueError, match=r"Operation 2 \(validate_patch\).*: patch"):
+            await call_tool(
+                "batch_tools",
+                {
+                    "operations": [
+                        {
+                            "tool": "apply_patch",
+                            "arguments": {
+                                "file_path": str(test_file),
+                                "patch": LINE2_MODIFIED_PATCH,
+                            },
+                        },
+                        {"tool": "validate_patch", "arguments": {"file_path": str(test_file)}},
+                    ]
+                },
+            )
+
+        # The apply_patch operation never ran
+        assert test_file.read_text() == "line1\nline2\n"
+
+    def test_batchable_tools_match_schemas(self, tool_schemas):
+        """Required batch arguments mirror each tool's input schema."""
+        for name, required in BATCHABLE_TOOLS.items():
+            assert list(required) == tool_schemas[name]["required"]
+
+    async def test_call_tool_returns_text_content(self, class_tmp, request):
         """Tool calls return TextContent with JSON."""
         # Create a test file
-        test_file = tmp_path / "test.txt"
+        test_file = class_tmp / f"{request.node.name}.txt"
         test_file.write_text("line1\nline2\n")
 
-        # Create a patch
-        patch = """--- test.txt
-+++ test.txt
-@@ -1,2 +1,2 @@
--line1
-+line1_modified
- line2
-"""
-
         # Call validate_patch (safe, read-only)
         result = await call_tool(
             "validate_patch",
             {
                 "file_path": str(test_file),
-                "patch": patch,
+                "patch": LINE1_MODIFIED_PATCH,
             },
         )
 
-        # Check return type
-        assert isinstance(result, list)
-        assert len(result) == 1
-        assert result[0].type == "text"
+        # Check return type and that the JSON is valid
+        parsed = unwrap_tool_result(result)
+        assert "success" in parsed
+
+    async def test_call_tool_result_is_indented_json(self):
+        """Results are serialized as indented JSON that round-trips to the result."""
+        result = await call_tool("inspect_patch", {"patch": OLD_TO_NEW_PATCH})
+
+        text = result[0].text
+        assert text.startswith('{\n  "success": true')
+        assert json.loads(text) == unwrap_tool_result(result)
+
+    async def test_call_tool_result_with_surrogates(self, tmp_path):
+        """A path with undecodable bytes still yields a JSON result, not an exception."""
+        missing = str(tmp_path) + "/\udcff.txt"
+
+        result = await call_tool(
+            "validate_patch", {"file_path": missing, "patch": LINE1_MODIFIED_PATCH}
+        )
 
-        # Check JSON is valid
         parsed = json.loads(result[0].text)
-        assert "success" in parsed
+        assert parsed["success"] is False
+        assert parsed["error_type"] == "file_not_found"
+        assert parsed["file_path"] == missing
 
-    @pytest.mark.asyncio
     async def test_inspect_patch_routing(self):
         """inspect_patch routes correctly."""
-        patch = """--- file.txt
-+++ file.txt
-@@ -1,1 +1,1 @@
--old
-+new
-"""
+        result = await call_tool("inspect_patch", {"patch": OLD_TO_NEW_PATCH})
 
-        result = await call_tool("inspect_patch", {"patch": patch})
-
-        parsed = json.loads(result[0].text)
+        parsed = unwrap_tool_result(result)
         assert parsed["success"] is True
         assert "files" in parsed
         assert len(parsed["files"]) == 1
 
-    @pytest.mark.asyncio
-    async def test_backup_file_routing(self, tmp_path):
+    async def test_backup_file_routing(self, class_tmp, request):
         """backup_file routes correctly."""
-        test_file = tmp_path / "backup_test.txt"
+        test_file = class_tmp / f"{request.node.name}.txt"
         test_file.write_text("content")
 
         result = await call_tool("backup_file", {"file_path": str(test_file)})
 
-        parsed = json.loads(result[0].text)
+        parsed = unwrap_tool_result(result)
         assert parsed["success"] is True
         assert "backup_file" in parsed
 
 
+BACKED_UP_CONTENT = "original content\n"
+
+
+@pytest_asyncio.fixture(scope="class")
+async def backed_up_file(tmp_path_factory):
+    """A file and a backup of it made through call_tool, created once per class.
+
+    Returns (file path, backup path). Tests may modify the file but must not
+    delete the backup.
+    """
+    test_file = tmp_path_factory.mktemp("backup_flow") / "backup_restore_test.txt"
+    test_file.write_text(BACKED_UP_CONTENT)
+
+    backup_result = await call_tool("backup_file", {"file_path": str(test_file)})
+
+    backup_data = unwrap_tool_result(backup_result)
+    assert backup_data["success"] is True
+    return test_file, backup_data["backup_file"]
+
+
 class TestToolIntegration:
     """Test tool integration and data flow."""
 
-    @pytest.mark.asyncio
-    async def test_validate_then_apply_flow(self, tmp_path):
+    async def test_validate_then_apply_flow(self, fake_fs):
         """Test validate followed by apply workflow."""
         # Setup
-        test_file = tmp_path / "flow_test.txt"
+        test_file = fake_fs / "flow_test.txt"
         test_file.write_text("line1\nline2\n")
-
-        patch = """--- flow_test.txt
-+++ flow_test.txt
-@@ -1,2 +1,2 @@
- line1
--line2
-+line2_modified
-"""
+        _parse_patch.cache_clear()
 
         # Step 1: Validate
         validate_result = await call_tool(
             "validate_patch",
             {
                 "file_path": str(test_file),
-                "patch": patch,
+                "patch": LINE2_MODIFIED_PATCH,
             },
         )
 
-        validate_data = json.loads(validate_result[0].text)
+        validate_data = unwrap_tool_result(validate_result)
         assert validate_data["success"] is True
         assert validate_data["can_apply"] is True
 
@@ -276,50 +312,99 @@ class TestToolIntegration:
             "apply_patch",
             {
                 "file_path": str(test_file),
-                "patch": patch,
+                "patch": LINE2_MODIFIED_PATCH,
             },
         )
 
-        apply_data = json.loads(apply_result[0].text)
+        apply_data = unwrap_tool_result(apply_result)
         assert apply_data["success"] is True
         assert apply_data["applied"] is True
 
-    @pytest.mark.asyncio
-    async def test_backup_and_restore_flow(self, tmp_path):
-        """Test backup followed by restore workflow."""
-        # Setup
-        test_file = tmp_path / "backup_restore_test.txt"
-        original_content = "original content\n"
-        test_file.write_text(original_content)
+        # apply_patch reused the parse from validate_patch
+        assert _parse_patch.cache_info().misses == 1
 
-        # Step 1: Backup
-        backup_result = await call_tool(
-            "backup_file",
-            {"file_path": str(test_file)},
+    async def test_batch_validate_then_apply_flow(self, fake_fs):
+        """Validate and apply run in order within one batch_tools call."""
+        test_file = fake_fs / "flow_test.txt"
+        test_file.write_text("line1\nline2\n")
+        arguments = {"file_path": str(test_file), "patch": LINE2_MODIFIED_PATCH}
+
+        result = await call_tool(
+            "batch_tools",
+            {
+                "operations": [
+                    {"tool": "validate_patch", "arguments": arguments},
+                    {"tool": "apply_patch", "arguments": arguments},
+                ]
+            },
         )
 
-        backup_data = json.loads(backup_result[0].text)
-        assert backup_data["success"] is True
-        backup_file_path = backup_data["backup_file"]
+        data = unwrap_tool_result(result)
+        assert data["success"] is True
+        assert data["completed_count"] == 2
+        assert data["results"][0]["can_apply"] is True
+        assert data["results"][1]["applied"] is True
+        assert test_file.read_text() == "line1\nline2_modified\n"
+
+    async def test_batch_stops_at_first_failure(self, fake_fs):
+        """Operations after a failed one are not run."""
+        test_file = fake_fs / "flow_test.txt"
+        test_file.write_text("line1\nother\n")
+        arguments = {"file_path": str(test_file), "patch": LINE2_MODIFIED_PATCH}
 
-        # Step 2: Modify file
+        result = await call_tool(
+            "batch_tools",
+            {
+                "operations": [
+                    {"tool": "validate_patch", "arguments": arguments},
+                    {"tool": "apply_patch", "arguments": arguments},
+                ]
+            },
+        )
+
+        data = unwrap_tool_result(result)
+        assert data["success"] is False
+        assert data["total_operations"] == 2
+        assert data["completed_count"] == 0
+        assert len(data["results"]) == 1
+        assert data["results"][0]["error_type"] == "context_mismatch"
+        assert test_file.read_text() == "line1\nother\n"
+
+    async def test_backup_and_restore_flow(self, backed_up_file):
+        """Test backup followed by restore workflow."""
+        test_file, backup_file_path = backed_up_file
+
+        # Modify file
         test_file.write_text("modified content\n")
 
-        # Step 3: Restore
+        # Restore
         restore_result = await call_tool(
             "restore_backup",
             {"backup_file": backup_file_path},
         )
 
-        restore_data = json.loads(restore_result[0].text)
+        restore_data = unwrap_tool_result(restore_result)
         assert restore_data["success"] is True
 
         # Verify content restored
-        assert test_file.read_text() == original_content
+        assert test_file.read_text() == BACKED_UP_CONTENT
+
+    async def test_restore_to_new_target_flow(self, backed_up_file, tmp_path):
+        """Test restoring a backup to a different target file."""
+        _, backup_file_path = backed_up_file
+        target = tmp_path / "restored.txt"
+
+        restore_result = await call_tool(
+            "restore_backup",
+            {"backup_file": backup_file_path, "target_file": str(target)},
+        )
+
+        restore_data = unwrap_tool_result(restore_result)
+        assert restore_data["success"] is True
+        assert target.read_text() == BACKED_UP_CONTENT
 
-    @pytest.mark.asyncio
     async def test_generate_inspect_flow(self, tmp_path):
-        """Test generate followed by inspect workflow."""
+        """Test generate followed by inspect workflow (end-to-end on the real filesystem)."""
         # Setup
         original = tmp_path / "original.txt"
         modified = tmp_path / "modified.txt"
@@ -335,14 +420,14 @@ class TestToolIntegration:
             },
         )
 
-        generate_data = json.loads(generate_result[0].text)
+        generate_data = unwrap_tool_result(generate_result)
         assert generate_data["success"] is True
         patch = generate_data["patch"]
 
         # Step 2: Inspect patch
         inspect_result = await call_tool("inspect_patch", {"patch": patch})
 
-        inspect_data = json.loads(inspect_result[0].text)
+        inspect_data = unwrap_tool_result(inspect_result)
         assert inspect_data["success"] is True
         assert inspect_data["files"][0]["lines_added"] == 1
         assert inspect_data["files"][0]["lines_removed"] == 1
@@ -8,16 +8,24 @@ Tests the patch validation functionality including:
 - Security checks
 """
 
-from patch_mcp.tools.validate import validate_patch
+import pytest
+
+from patch_mcp.tools.validate import (
+    PARSE_CACHE_MAX_PATCH_SIZE,
+    _parse_patch,
+    _parsed_patch,
+    validate_patch,
+)
+from patch_mcp.utils import MAX_PATCH_SIZE
 
 
 class TestValidatePatch:
     """Test suite for validate_patch tool."""
 
-    def test_validate_can_apply(self, tmp_path):
+    def test_validate_can_apply(self, fake_fs):
         """When patch can be applied, success=True."""
         # Create file
-        file = tmp_path / "config.py"
+        file = fake_fs / "config.py"
         file.write_text("DEBUG = False\nLOG_LEVEL = 'INFO'\nPORT = 8000\n")
 
         # Create patch that matches
@@ -47,10 +55,10 @@ class TestValidatePatch:
         assert result["preview"]["affected_line_range"]["start"] >= 1
         assert result["preview"]["affected_line_range"]["end"] >= 1
 
-    def test_validate_cannot_apply(self, tmp_path):
+    def test_validate_cannot_apply(self, fake_fs):
         """When patch cannot be applied, success=False."""
         # Create file with different content
-        file = tmp_path / "config.py"
+        file = fake_fs / "config.py"
         file.write_text("DEBUG = False\nLOG_LEVEL = 'WARNING'\nPORT = 8000\n")
 
         # Create patch that expects different content
@@ -78,9 +86,9 @@ class TestValidatePatch:
         # Preview should still be present
         assert "preview" in result
 
-    def test_validate_invalid_patch(self, tmp_path):
+    def test_validate_invalid_patch(self, fake_fs):
         """Invalid patch format returns error."""
-        file = tmp_path / "config.py"
+        file = fake_fs / "config.py"
         file.write_text("content\n")
 
         # Invalid patch (missing headers)
@@ -97,9 +105,9 @@ class TestValidatePatch:
         assert result["error_type"] == "invalid_patch"
         assert "Invalid patch format" in result["error"]
 
-    def test_validate_file_not_found(self, tmp_path):
+    def test_validate_file_not_found(self, fake_fs):
         """Missing file returns file_not_found error."""
-        missing = tmp_path / "missing.txt"
+        missing = fake_fs / "missing.txt"
         patch = """--- missing.txt
 +++ missing.txt
 @@ -1,1 +1,1 @@
@@ -112,12 +120,12 @@ class TestValidatePatch:
         assert result["success"] is False
         assert result["error_type"] == "file_not_found"
 
-    def test_validate_symlink_rejected(self, tmp_path):
+    def test_validate_symlink_rejected(self, fake_fs):
         """Symlinks should be rejected (security policy)."""
         # Create real file and symlink
-        real_file = tmp_path / "real.txt"
+        real_file = fake_fs / "real.txt"
         real_file.write_text("content\n")
-        symlink = tmp_path / "link.txt"
+        symlink = fake_fs / "link.txt"
         symlink.symlink_to(real_file)
 
         patch = """--- link.txt
@@ -132,9 +140,9 @@ class TestValidatePatch:
         assert result["success"] is False
         assert result["error_type"] == "symlink_error"
 
-    def test_validate_binary_rejected(self, tmp_path):
+    def test_validate_binary_rejected(self, fake_fs):
         """Binary files should be rejected."""
-        binary = tmp_path / "binary.dat"
+        binary = fake_fs / "binary.dat"
         binary.write_bytes(b"\x00\x01\x02" * 100)
 
         patch = """--- binary.dat
@@ -149,9 +157,21 @@ class TestValidatePatch:
         assert result["success"] is False
         assert result["error_type"] == "binary_file"
 
-    def test_validate_preview_information(self, tmp_path):
+    def test_validate_oversized_patch_rejected(self, fake_fs):
+        """Patches over MAX_PATCH_SIZE are rejected before parsing."""
+        file = fake_fs / "file.txt"
+        file.write_text("content\n")
+
+        patch = "--- file.txt\n+++ file.txt\n" + "+x\n" * (MAX_PATCH_SIZE // 3 + 1)
+
+        result = validate_patch(str(file), patch)
+
+        assert result["success"] is False
+        assert result["error_type"] == "resource_limit"
+
+    def test_validate_preview_information(self, fake_fs):
         """Preview should contain accurate information."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         file.write_text("line1\nline2\nline3\nline4\nline5\n")
 
         patch = """--- file.py
@@ -181,9 +201,9 @@ class TestValidatePatch:
         assert preview["affected_line_range"]["start"] > 0
         assert preview["affected_line_range"]["end"] > 0
 
-    def test_validate_empty_patch(self, tmp_path):
+    def test_validate_empty_patch(self, fake_fs):
         """Empty patch should be valid and applicable."""
-        file = tmp_path / "file.txt"
+        file = fake_fs / "file.txt"
         file.write_text("content\n")
 
         result = validate_patch(str(file), "")
@@ -193,9 +213,19 @@ class TestValidatePatch:
         assert result["can_apply"] is True
         assert result["preview"]["hunks"] == 0
 
-    def test_validate_multiple_hunks(self, tmp_path):
+    def test_validate_empty_patch_skips_file(self, fake_fs):
+        """Empty patch succeeds without accessing the file."""
+        missing = fake_fs / "missing.txt"
+
+        result = validate_patch(str(missing), "  \n")
+
+        assert result["success"] is True
+        assert result["can_apply"] is True
+        assert result["preview"]["hunks"] == 0
+
+    def test_validate_multiple_hunks(self, fake_fs):
         """Validate patch with multiple hunks."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         file.write_text(
             "line1\nline2\nline3\nline4\nline5\n" "line6\nline7\nline8\nline9\nline10\n"
         )
@@ -221,9 +251,9 @@ class TestValidatePatch:
         assert result["preview"]["lines_to_add"] == 2
         assert result["preview"]["lines_to_remove"] == 2
 
-    def test_validate_context_partially_matches(self, tmp_path):
+    def test_validate_context_partially_matches(self, fake_fs):
         """Context that only partially matches should fail."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         file.write_text("line1\nmodified_line2\nline3\n")
 
         # Patch expects original line2
@@ -243,15 +273,78 @@ class TestValidatePatch:
         assert result["can_apply"] is False
         assert result["error_type"] == "context_mismatch"
 
-    def test_validate_hunk_out_of_range(self, tmp_path):
+    def test_validate_reason_points_at_moved_line(self, fake_fs):
+        """When a removed line moved, the reason names its current line."""
+        file = fake_fs / "file.py"
+        file.write_text("a\nb\nc\nline1\nline2\nline3\n")
+
+        # Patch was made before three lines were inserted at the top
+        patch = """--- file.py
++++ file.py
+@@ -1,3 +1,3 @@
+-line1
++line1 changed
+ line2
+ line3
+"""
+
+        result = validate_patch(str(file), patch)
+
+        assert result["success"] is False
+        assert result["error_type"] == "context_mismatch"
+        assert "(the line is at line 4)" in result["reason"]
+
+    def test_validate_reason_omits_ambiguous_moved_line(self, fake_fs):
+        """A mismatched line that occurs several times gets no location hint."""
+        file = fake_fs / "file.py"
+        file.write_text("a\nx\n}\nb\n}\n")
+
+        patch = """--- file.py
++++ file.py
+@@ -1,2 +1,2 @@
+ a
+-}
++};
+"""
+
+        result = validate_patch(str(file), patch)
+
+        assert result["success"] is False
+        assert result["error_type"] == "context_mismatch"
+        assert result["reason"] == "Context mismatch at line 2: expected '}' but found 'x'"
+
+    def test_validate_context_line_mismatch(self, fake_fs):
+        """A differing context line fails, naming the first mismatched line."""
+        file = fake_fs / "file.py"
+        file.write_text("line1\nline2\nchanged3\nline4\n")
+
+        patch = """--- file.py
++++ file.py
+@@ -1,4 +1,4 @@
+ line1
+-line2
++line2 modified
+ line3
+ line4
+"""
+
+        result = validate_patch(str(file), patch)
+
+        assert result["success"] is False
+        assert result["error_type"] == "context_mismatch"
+        assert result["reason"] == (
+            "Context mismatch at line 3: expected 'line3' but found 'changed3'"
+        )
+
+    def test_validate_hunk_out_of_range(self, fake_fs):
         """Hunk that references lines beyond file should fail."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         file.write_text("line1\nline2\n")
 
         # Patch expects more lines than file has
         patch = """--- file.py
 +++ file.py
-@@ -1,10 +1,10 @@
+@@ -1,3 +1,3 @@
  line1
  line2
 -line3
@@ -264,10 +357,31 @@ class TestValidatePatch:
         assert result["success"] is False
         assert result["can_apply"] is False
 
-    def test_validate_encoding_error(self, tmp_path):
+    def test_validate_hunk_count_mismatch(self, fake_fs):
+        """A header count larger than the hunk body is an invalid patch."""
+        file = fake_fs / "file.txt"
+        file.write_text("l1\nl2\nl3\nl4\n")
+
+        # Header covers 3 lines, body only 2 - applying it would drop l3 unmatched
+        patch = """--- file.txt
++++ file.txt
+@@ -1,3 +1,3 @@
+-l1
++X
+ l2
+"""
+
+        result = validate_patch(str(file), patch)
+
+        assert result["success"] is False
+        assert result["valid"] is False
+        assert result["error_type"] == "invalid_patch"
+        assert "hunk at line 3" in result["error"]
+
+    def test_validate_encoding_error(self, fake_fs):
         """Non-UTF-8 file should return encoding error."""
         # Create file with invalid UTF-8 that's not detected as binary
-        file = tmp_path / "file.txt"
+        file = fake_fs / "file.txt"
         # Write mostly text but with some invalid UTF-8
         file.write_bytes(b"line1\nline2\n" + b"\xff\xfe" + b"\nline3\n")
 
@@ -284,9 +398,9 @@ class TestValidatePatch:
         assert result["success"] is False
         assert result["error_type"] in ["encoding_error", "binary_file"]
 
-    def test_validate_preserves_line_endings(self, tmp_path):
+    def test_validate_preserves_line_endings(self, fake_fs):
         """Validation should handle different line endings."""
-        file = tmp_path / "file.txt"
+        file = fake_fs / "file.txt"
         file.write_text("line1\nline2\nline3\n")
 
         # Patch with the same content
@@ -304,9 +418,28 @@ class TestValidatePatch:
         assert result["success"] is True
         assert result["can_apply"] is True
 
-    def test_validate_addition_only(self, tmp_path):
+    def test_validate_crlf_file(self, fake_fs):
+        """CRLF and CR line endings in the file match LF patch lines."""
+        file = fake_fs / "file.txt"
+        file.write_bytes(b"line1\r\nline2\rline3\n")
+
+        patch = """--- file.txt
++++ file.txt
+@@ -1,3 +1,3 @@
+ line1
+-line2
++line2 modified
+ line3
+"""
+
+        result = validate_patch(str(file), patch)
+
+        assert result["success"] is True
+        assert result["can_apply"] is True
+
+    def test_validate_addition_only(self, fake_fs):
         """Patch with only additions."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         file.write_text("line1\nline2\n")
 
         patch = """--- file.py
@@ -323,9 +456,9 @@ class TestValidatePatch:
         assert result["preview"]["lines_to_add"] == 1
         assert result["preview"]["lines_to_remove"] == 0
 
-    def test_validate_removal_only(self, tmp_path):
+    def test_validate_removal_only(self, fake_fs):
         """Patch with only removals."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         file.write_text("line1\nremove_me\nline2\n")
 
         patch = """--- file.py
@@ -342,9 +475,9 @@ class TestValidatePatch:
         assert result["preview"]["lines_to_add"] == 0
         assert result["preview"]["lines_to_remove"] == 1
 
-    def test_validate_whitespace_sensitive(self, tmp_path):
+    def test_validate_whitespace_sensitive(self, fake_fs):
         """Validation should be whitespace-sensitive."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         file.write_text("line1\nline2 \nline3\n")  # line2 has trailing space
 
         # Patch expects no trailing space
@@ -364,9 +497,9 @@ class TestValidatePatch:
         assert result["success"] is False or result["success"] is True
         # The exact behavior depends on whitespace handling
 
-    def test_validate_reason_field_present(self, tmp_path):
+    def test_validate_reason_field_present(self, fake_fs):
         """When cannot apply, reason field must be present."""
-        file = tmp_path / "file.py"
+        file = fake_fs / "file.py"
         file.write_text("wrong\ncontent\n")
 
         patch = """--- file.py
@@ -385,3 +518,72 @@ class TestValidatePatch:
         assert "reason" in result
         assert isinstance(result["reason"], str)
         assert len(result["reason"]) > 0
+
+    def test_validate_noncanonical_hunk_header(self, fake_fs):
+        """Hunk headers with extra whitespace are still accepted."""
+        file = fake_fs / "file.py"
+        file.write_text("line1\nline2\n")
+
+        patch = """--- file.py
++++ file.py
+@@  -1,2  +1,2  @@
+ line1
+-line2
++line2 modified
+"""
+
+        result = validate_patch(str(file), patch)
+
+        assert result["success"] is True
+        assert result["preview"]["hunks"] == 1
+        assert result["preview"]["affected_line_range"] == {"start": 1, "end": 2}
+
+    def test_validate_malformed_hunk_header(self, fake_fs):
+        """Hunk header with a non-numeric range is reported as invalid_patch."""
+        file = fake_fs / "file.py"
+        file.write_text("line1\n")
+
+        patch = """--- file.py
++++ file.py
+@@ -a,1 +1,1 @@
+-line1
++changed
+"""
+
+        result = validate_patch(str(file), patch)
+
+        assert result["success"] is False
+        assert result["valid"] is False
+        assert result["error_type"] == "invalid_patch"
+        assert "Cannot parse hunk header" in result["error"]
+
+    def test_parse_result_is_read_only(self):
+        """The cached parse result and its hunks cannot be modified by a caller."""
+        result = _parsed_patch("--- f\n+++ f\n@@ -1,1 +1,1 @@\n-a\n+b\n")
+
+        with pytest.raises(TypeError):
+            result["valid"] = False
+        with pytest.raises(AttributeError):
+            result["hunks"][0].source_start = 5
+
+    def test_parse_shares_repeated_line_encodings(self):
+        """Each distinct line is encoded once, however often and wherever it repeats."""
+        result = _parsed_patch("--- f\n+++ f\n@@ -1,3 +1,3 @@\n }\n-}\n+}\n }\n")
+
+        hunk = result["hunks"][0]
+        assert hunk.old_lines == (b"}", b"}", b"}")
+        assert hunk.new_lines == (b"}\n", b"}\n", b"}\n")
+        assert len({id(line) for line in hunk.old_lines}) == 1
+        assert len({id(line) for line in hunk.new_lines}) == 1
+
+    def test_large_patch_bypasses_parse_cache(self):
+        """Patches over PARSE_CACHE_MAX_PATCH_SIZE are parsed without being cached."""
+        count = PARSE_CACHE_MAX_PATCH_SIZE // 3 + 1
+        patch = f"--- f\n+++ f\n@@ -0,0 +1,{count} @@\n" + "+x\n" * count
+
+        _parse_patch.cache_clear()
+        result = _parsed_patch(patch)
+
+        assert result["valid"] is True
+        assert result["lines_to_add"] == count
+        assert _parse_patch.cache_info().currsize == 0